@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+import argparse
+import importlib.util
+import json
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+ENRICH_SCRIPT = SCRIPTS_DIR / "enrich-bl2-max-abilities-from-lootlemon.py"
+
+GOLDEN_DIR = Path(".agent/bl2/item-cards/golden")
+CARDS_DIR = GOLDEN_DIR / "cards"
+MANIFEST_PATH = GOLDEN_DIR / "manifest.json"
+BASELINE_PATH = GOLDEN_DIR / "baseline.json"
+REPORT_PATH = Path(".agent/bl2/item-cards/benchmark-report.json")
+
+STAGES = ["preprocess", "layout", "ocr", "parse"]
+
+
+def load_enrich_module() -> ModuleType:
+    # The OCR pipeline lives in a hyphenated script; load it by path so the benchmark measures exactly that code.
+    spec = importlib.util.spec_from_file_location("enrich_bl2_max_abilities", ENRICH_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    freeze_parser = commands.add_parser(
+        "freeze",
+        help="Copy cached card downloads into the golden set with hand-verified max/abilities from --truth",
+    )
+    freeze_parser.add_argument("items", nargs="+", help="category/slug, or a bare slug that exists in one category only")
+    freeze_parser.add_argument(
+        "--truth",
+        type=Path,
+        required=True,
+        help='JSON object mapping "category/slug" to hand-verified {"max": {...}, "abilities": [...]}',
+    )
+
+    run_parser = commands.add_parser("run", help="OCR every golden card offline and score it")
+    run_parser.add_argument("--ocr-backend", choices=["auto", "tesserocr", "subprocess"], default="auto")
+    run_parser.add_argument("--no-layout", action="store_true")
+    run_parser.add_argument("--save-baseline", action="store_true", help="Store this run as the comparison baseline")
+    run_parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit 1 if field or ability accuracy drops below the baseline",
+    )
+    return parser.parse_args()
+
+
+def load_manifest() -> List[dict]:
+    if not MANIFEST_PATH.exists():
+        return []
+    return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+
+
+def case_key(case: dict) -> str:
+    return f"{case['category']}/{case['slug']}"
+
+
+def resolve_item(enrich: ModuleType, name: str) -> Path:
+    if "/" in name:
+        item_path = enrich.DATA_ROOT / f"{name}.json"
+        if not item_path.exists():
+            raise SystemExit(f"no item JSON {item_path}")
+        return item_path
+    item_paths = sorted(enrich.DATA_ROOT.glob(f"*/{name}.json"))
+    if not item_paths:
+        raise SystemExit(f"no item JSON for {name} under {enrich.DATA_ROOT}")
+    if len(item_paths) > 1:
+        options = ", ".join(f"{path.parent.name}/{name}" for path in item_paths)
+        raise SystemExit(f"{name} exists in several categories; freeze one of: {options}")
+    return item_paths[0]
+
+
+def load_truth(path: Path) -> Dict[str, dict]:
+    truth = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(truth, dict):
+        raise SystemExit(f"{path} must map category/slug to {{\"max\": ..., \"abilities\": ...}}")
+    for key, entry in truth.items():
+        max_values = entry.get("max") if isinstance(entry, dict) else None
+        abilities = entry.get("abilities") if isinstance(entry, dict) else None
+        if not isinstance(max_values, dict) or not all(isinstance(value, (int, float)) for value in max_values.values()):
+            raise SystemExit(f"{path}: {key} needs a max object of numbers")
+        if not isinstance(abilities, list) or not all(isinstance(line, str) for line in abilities):
+            raise SystemExit(f"{path}: {key} needs an abilities list of strings")
+    return truth
+
+
+def freeze(enrich: ModuleType, names: List[str], truth_path: Path) -> None:
+    # Truth never comes from the item JSON: its max/abilities are this pipeline's own OCR output, and scoring the
+    # OCR against them would only measure agreement with an earlier run.
+    truth = load_truth(truth_path)
+    cases = {case_key(case): case for case in load_manifest()}
+
+    for name in names:
+        item_path = resolve_item(enrich, name)
+        category, slug = item_path.parent.name, item_path.stem
+        key = f"{category}/{slug}"
+        if key not in truth:
+            raise SystemExit(f"no verified values for {key} in {truth_path}")
+        raw_paths = sorted((enrich.RAW_DIR / category).glob(f"{slug}.*"))
+        if not raw_paths:
+            raise SystemExit(f"no cached card for {key} in {enrich.RAW_DIR / category}; run the enrich pass first")
+
+        raw_path = raw_paths[0]
+        item = json.loads(item_path.read_text(encoding="utf-8"))
+        card = f"{category}/{raw_path.name}"
+        (CARDS_DIR / category).mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(raw_path, CARDS_DIR / card)
+        cases[key] = {
+            "slug": slug,
+            "category": category,
+            "card": card,
+            "red_text": ((item.get("special") or {}).get("title") or "").strip(),
+            "max": truth[key]["max"],
+            "abilities": truth[key]["abilities"],
+        }
+        print(f"Froze {key}")
+
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(f"{json.dumps([cases[key] for key in sorted(cases)], indent=2)}\n", encoding="utf-8")
+
+
+def same_number(left: object, right: object) -> bool:
+    if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+        return False
+    return abs(float(left) - float(right)) < 1e-6
+
+
+def score_case(case: dict, predicted: Dict[str, object]) -> dict:
+    expected_max: Dict[str, object] = case["max"]
+    predicted_max: Dict[str, object] = predicted["stats"]
+    fields = {key: same_number(predicted_max.get(key), value) for key, value in expected_max.items()}
+    spurious = sorted(set(predicted_max) - set(expected_max))
+
+    expected_abilities: List[str] = case["abilities"]
+    predicted_abilities: List[str] = predicted["abilities"]
+    matched_lines = len(set(expected_abilities) & set(predicted_abilities))
+
+    return {
+        "slug": case["slug"],
+        "category": case["category"],
+        "fields": fields,
+        "wrong": {key: {"expected": expected_max[key], "got": predicted_max.get(key)} for key, ok in fields.items() if not ok},
+        "spurious": spurious,
+        "abilities_exact": predicted_abilities == expected_abilities,
+        "ability_lines_expected": len(expected_abilities),
+        "ability_lines_matched": matched_lines,
+    }
+
+
+def summarise(scores: List[dict], seconds: float, timings: Dict[str, float]) -> dict:
+    per_field: Dict[str, List[int]] = {}
+    for score in scores:
+        for key, ok in score["fields"].items():
+            totals = per_field.setdefault(key, [0, 0])
+            totals[0] += int(ok)
+            totals[1] += 1
+
+    fields_correct = sum(correct for correct, _ in per_field.values())
+    fields_total = sum(total for _, total in per_field.values())
+    lines_expected = sum(score["ability_lines_expected"] for score in scores)
+    cards = len(scores)
+
+    return {
+        "cards": cards,
+        "field_accuracy": round(fields_correct / fields_total, 4) if fields_total else None,
+        "per_field_accuracy": {
+            key: {"correct": correct, "total": total, "accuracy": round(correct / total, 4)}
+            for key, (correct, total) in sorted(per_field.items())
+        },
+        "spurious_fields": sum(len(score["spurious"]) for score in scores),
+        "abilities_exact": round(sum(score["abilities_exact"] for score in scores) / cards, 4) if cards else None,
+        "ability_line_recall": (
+            round(sum(score["ability_lines_matched"] for score in scores) / lines_expected, 4) if lines_expected else None
+        ),
+        "seconds": round(seconds, 3),
+        "cards_per_second": round(cards / seconds, 3) if seconds else None,
+        "stage_seconds": {stage: round(timings.get(stage, 0.0), 3) for stage in STAGES},
+        "stage_ms_per_card": {stage: round(1000 * timings.get(stage, 0.0) / cards, 1) if cards else None for stage in STAGES},
+    }
+
+
+def compare(summary: dict, scores: List[dict], baseline: dict) -> dict:
+    previous = baseline.get("summary") or {}
+    deltas: Dict[str, Optional[float]] = {}
+    for metric in ("field_accuracy", "abilities_exact", "ability_line_recall", "cards_per_second"):
+        now, before = summary.get(metric), previous.get(metric)
+        deltas[metric] = round(now - before, 4) if now is not None and before is not None else None
+
+    before_cards = {case_key(score): score for score in baseline.get("cards") or []}
+    regressions: List[dict] = []
+    improvements: List[dict] = []
+    for score in scores:
+        before = before_cards.get(case_key(score))
+        if before is None:
+            continue
+        for key, ok in score["fields"].items():
+            was_ok = before["fields"].get(key)
+            if was_ok and not ok:
+                regressions.append({"slug": score["slug"], "category": score["category"], "field": key, **score["wrong"][key]})
+            elif was_ok is False and ok:
+                improvements.append({"slug": score["slug"], "category": score["category"], "field": key})
+        if before["abilities_exact"] and not score["abilities_exact"]:
+            regressions.append({"slug": score["slug"], "category": score["category"], "field": "abilities"})
+        elif not before["abilities_exact"] and score["abilities_exact"]:
+            improvements.append({"slug": score["slug"], "category": score["category"], "field": "abilities"})
+
+    return {
+        "baseline_recorded_at": baseline.get("recordedAt"),
+        "deltas": deltas,
+        "regressions": regressions,
+        "improvements": improvements,
+    }
+
+
+def run(enrich: ModuleType, args: argparse.Namespace) -> int:
+    cases = load_manifest()
+    if not cases:
+        raise SystemExit(f"no golden cards in {MANIFEST_PATH}; add some with `freeze <category/slug> ... --truth <file>`")
+
+    # No cache and no network: every card goes through preprocessing, layout, OCR and parsing from its frozen bytes.
+    enrich.configure_ocr(args.ocr_backend, debug_artefacts=False, card_layout=not args.no_layout, ocr_cache=False)
+
+    timings: Dict[str, float] = {}
+    scores: List[dict] = []
+    started = time.perf_counter()
+    for case in cases:
+        data = (CARDS_DIR / case["card"]).read_bytes()
+        texts = enrich.ocr_card_bytes(data, case["slug"], case["category"], timings)
+        parse_started = time.perf_counter()
+        predicted = enrich.parse_card_texts(texts, case["red_text"], case["category"])
+        timings["parse"] = timings.get("parse", 0.0) + time.perf_counter() - parse_started
+        scores.append(score_case(case, predicted))
+    seconds = time.perf_counter() - started
+
+    summary = summarise(scores, seconds, timings)
+    report = {
+        "completedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "ocr_backend": enrich.resolve_ocr_backend(args.ocr_backend),
+        "card_layout": not args.no_layout,
+        "summary": summary,
+        "cards": scores,
+    }
+
+    exit_code = 0
+    if BASELINE_PATH.exists():
+        report["baseline"] = compare(summary, scores, json.loads(BASELINE_PATH.read_text(encoding="utf-8")))
+        deltas = report["baseline"]["deltas"]
+        accuracy_dropped = any((deltas.get(metric) or 0) < 0 for metric in ("field_accuracy", "abilities_exact"))
+        if args.fail_on_regression and accuracy_dropped:
+            exit_code = 1
+
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+    if args.save_baseline:
+        baseline = {"recordedAt": report["completedAt"], "summary": summary, "cards": scores}
+        BASELINE_PATH.write_text(f"{json.dumps(baseline, indent=2)}\n", encoding="utf-8")
+
+    print(json.dumps({"summary": summary, "baseline": report.get("baseline", {}).get("deltas")}, indent=2))
+    print(f"Report: {REPORT_PATH}")
+    return exit_code
+
+
+def main() -> None:
+    args = parse_args()
+    enrich = load_enrich_module()
+    if args.command == "freeze":
+        freeze(enrich, args.items, args.truth)
+        return
+    sys.exit(run(enrich, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional
 import requests
 from bs4 import BeautifulSoup
 
+from slug_registry import SlugRegistry
+
 USER_AGENT = {"user-agent": "Mozilla/5.0 (compatible; BorderlensBot/1.0)"}
 
 LOOTLEMON_LIST_URL = "https://www.lootlemon.com/db/borderlands-2/class-mods"
@@ -728,6 +730,7 @@ def main() -> None:
     if args.limit and args.limit > 0:
         candidates = candidates[: args.limit]
 
+    registry = SlugRegistry()
     written = 0
     wiki_only = 0
     with_wiki = 0
@@ -741,9 +744,10 @@ def main() -> None:
             or legendary_class_map.get(candidate.name)
             or "class"
         )
+        class_suffix = CLASS_SLUG_MAP.get(class_name_for_slug, slugify(class_name_for_slug))
         base_slug = slugify(candidate.name)
         if name_counts.get(normalize_key(candidate.name), 0) > 1:
-            base_slug = f"{base_slug}-{CLASS_SLUG_MAP.get(class_name_for_slug, slugify(class_name_for_slug))}"
+            base_slug = f"{base_slug}-{class_suffix}"
 
         try:
             doc = build_doc(candidate, base_slug, legendary_class_map)
@@ -756,14 +760,16 @@ def main() -> None:
         if doc["resources"].get("wiki"):
             with_wiki += 1
 
-        output_path = OUTPUT_DIR / f"{base_slug}.json"
-        output_path.write_text(f"{json.dumps(doc, indent=2, ensure_ascii=True)}\n", encoding="utf-8")
+        # The registry falls back to the class suffix if the plain slug is already owned by another item on disk.
+        output_path = registry.write_item(OUTPUT_DIR, doc, suffix=class_suffix)
         created.append(output_path.name)
         for skill in doc.get("skills", []):
             if skill not in all_skills:
                 all_skills.append(skill)
         written += 1
 
+    registry.save()
+
     report = {
         "lootlemon_items": len(loot_items),
         "wiki_category_members": len(wiki_titles),
@@ -773,6 +779,7 @@ def main() -> None:
         "created_files": created,
         "skill_count": len(all_skills),
         "skills": sorted(all_skills),
+        "slug_registry": registry.summary(),
         "failures": failures,
     }
     REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
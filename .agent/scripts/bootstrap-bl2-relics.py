@@ -10,6 +10,8 @@ from typing import Dict, List, Optional
 import requests
 from bs4 import BeautifulSoup
 
+from slug_registry import SlugRegistry
+
 USER_AGENT = {"user-agent": "Mozilla/5.0 (compatible; BorderlensBot/1.0)"}
 
 LOOTLEMON_LIST_URL = "https://www.lootlemon.com/db/borderlands-2/relics"
@@ -598,6 +600,7 @@ def main() -> None:
     if args.limit and args.limit > 0:
         candidates = candidates[: args.limit]
 
+    registry = SlugRegistry()
     written = 0
     wiki_only = 0
     with_wiki = 0
@@ -617,11 +620,12 @@ def main() -> None:
         if doc["resources"].get("wiki"):
             with_wiki += 1
 
-        output_path = OUTPUT_DIR / f"{slug}.json"
-        output_path.write_text(f"{json.dumps(doc, indent=2, ensure_ascii=True)}\n", encoding="utf-8")
+        output_path = registry.write_item(OUTPUT_DIR, doc)
         created.append(output_path.name)
         written += 1
 
+    registry.save()
+
     report = {
         "lootlemon_items": len(loot_items),
         "wiki_category_members": len(wiki_titles_all),
@@ -630,6 +634,7 @@ def main() -> None:
         "wiki_only_written": wiki_only,
         "with_wiki_url": with_wiki,
         "created_files": created,
+        "slug_registry": registry.summary(),
         "failures": failures,
     }
     REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
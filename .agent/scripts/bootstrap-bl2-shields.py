@@ -9,6 +9,8 @@ from typing import Dict, List, Optional
 import requests
 from bs4 import BeautifulSoup
 
+from slug_registry import SlugRegistry
+
 USER_AGENT = {"user-agent": "Mozilla/5.0 (compatible; BorderlensBot/1.0)"}
 
 LOOTLEMON_LIST_URL = "https://www.lootlemon.com/db/borderlands-2/shields"
@@ -327,6 +329,7 @@ def main() -> None:
     loot_items = parse_lootlemon_list()
     wiki_titles = get_wiki_category_titles()
 
+    registry = SlugRegistry()
     written = 0
     with_wiki = 0
     missing_wiki: List[str] = []
@@ -383,10 +386,11 @@ def main() -> None:
             if red_text:
                 doc["special"]["title"] = red_text
 
-        output_path = OUTPUT_DIR / f"{item.slug}.json"
-        output_path.write_text(f"{json.dumps(doc, indent=2, ensure_ascii=True)}\n", encoding="utf-8")
+        registry.write_item(OUTPUT_DIR, doc)
         written += 1
 
+    registry.save()
+
     report = {
         "written": written,
         "lootlemon_items": len(loot_items),
@@ -394,6 +398,7 @@ def main() -> None:
         "with_wiki_url": with_wiki,
         "missing_wiki_url": len(missing_wiki),
         "missing_wiki_items": missing_wiki,
+        "slug_registry": registry.summary(),
     }
     REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
     print(json.dumps(report, indent=2))
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+from catalogue_images import DATA_ROOT, PUBLIC_ROOT, item_image_path, sha256_file
+
+
+DERIVED_ROOT = PUBLIC_ROOT / "img/derived/games"
+LEDGER_PATH = Path(".agent/index/image-derivatives.json")
+
+# Item cards show images around 300px wide and the item page header around 600px; 960 covers that header at 1.5x.
+WIDTHS = (320, 640, 960)
+FORMATS = {
+    "avif": {"quality": 55, "speed": 6},
+    "webp": {"quality": 82, "method": 6},
+}
+
+
+def encoder_params() -> dict:
+    return {"widths": list(WIDTHS), "formats": FORMATS}
+
+
+def target_widths(width: int) -> list[int]:
+    # Never upscale; an image narrower than every target still gets one variant at its own width.
+    return [target for target in WIDTHS if target < width] or [width]
+
+
+def derived_path(key: str, width: int, fmt: str) -> Path:
+    return DERIVED_ROOT / f"{key}-{width}w.{fmt}"
+
+
+def public_url(path: Path) -> str:
+    return f"/{path.relative_to(PUBLIC_ROOT).as_posix()}"
+
+
+def encode(task: tuple[str, str]) -> dict:
+    key, source = task
+    variants: list[dict] = []
+    with Image.open(source) as im:
+        has_alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+        image = im.convert("RGBA" if has_alpha else "RGB")
+
+    for width in target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        for fmt, options in FORMATS.items():
+            out_path = derived_path(key, width, fmt)
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+            resized.save(tmp_path, format=fmt.upper(), **options)
+            os.replace(tmp_path, out_path)
+            variants.append({
+                "format": fmt,
+                "width": width,
+                "height": height,
+                "bytes": out_path.stat().st_size,
+                "url": public_url(out_path),
+            })
+    return {"width": image.width, "height": image.height, "variants": variants}
+
+
+def iter_sources() -> list[tuple[str, Path]]:
+    sources: list[tuple[str, Path]] = []
+    for json_path in sorted(DATA_ROOT.glob("*/*/*.json")):
+        item = json.loads(json_path.read_text(encoding="utf-8"))
+        path = item_image_path(json_path, item)
+        if path is not None:
+            sources.append((f"{json_path.parent.parent.name}/{json_path.parent.name}/{item.get('slug') or json_path.stem}", path))
+    return sources
+
+
+def load_ledger(full: bool) -> dict[str, dict]:
+    if full or not LEDGER_PATH.exists():
+        return {}
+    payload = json.loads(LEDGER_PATH.read_text(encoding="utf-8"))
+    if payload.get("params") != encoder_params():
+        return {}
+    return payload.get("images") or {}
+
+
+def outputs_present(entry: dict) -> bool:
+    return all((PUBLIC_ROOT / variant["url"].lstrip("/")).exists() for variant in entry["variants"])
+
+
+def prune_outputs(images: dict[str, dict]) -> int:
+    # Everything under DERIVED_ROOT is ours, so anything the new ledger does not reference goes: deleted items,
+    # widths an edited (narrower) image no longer gets, and whole generations left by --full or a params change.
+    keep = {PUBLIC_ROOT / variant["url"].lstrip("/") for entry in images.values() for variant in entry["variants"]}
+    removed = 0
+    for path in sorted(DERIVED_ROOT.rglob("*"), reverse=True):
+        if path.is_dir():
+            if not any(path.iterdir()):
+                path.rmdir()
+        elif path not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def build(full: bool, workers: int) -> dict:
+    previous = load_ledger(full)
+    images: dict[str, dict] = {}
+    tasks: list[tuple[str, str]] = []
+    sources: dict[str, dict] = {}
+
+    for key, path in iter_sources():
+        stat = path.stat()
+        cached = previous.get(key)
+        if cached and cached["source"] == str(path) and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            if outputs_present(cached):
+                images[key] = cached
+                continue
+
+        digest = sha256_file(path)
+        source = {"source": str(path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+        if cached and cached["sha256"] == digest and outputs_present(cached):
+            images[key] = {**cached, **source}
+            continue
+        sources[key] = source
+        tasks.append((key, str(path)))
+
+    workers = max(1, min(workers, len(tasks) or 1))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(encode, tasks, chunksize=2))
+    else:
+        results = [encode(task) for task in tasks]
+
+    for (key, _), result in zip(tasks, results):
+        images[key] = {**sources[key], **result}
+
+    pruned = prune_outputs(images)
+
+    LEDGER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    LEDGER_PATH.write_text(
+        json.dumps({"params": encoder_params(), "images": images}, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+
+    source_bytes = sum(entry["size"] for entry in images.values())
+    smallest = {fmt: 0 for fmt in FORMATS}
+    for entry in images.values():
+        for fmt in FORMATS:
+            smallest[fmt] += min(variant["bytes"] for variant in entry["variants"] if variant["format"] == fmt)
+    return {
+        "images": len(images),
+        "encoded": len(tasks),
+        "reused": len(images) - len(tasks),
+        "pruned_files": pruned,
+        "source_bytes": source_bytes,
+        "smallest_variant_bytes": smallest,
+        "ledger": str(LEDGER_PATH),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true", help="Ignore the ledger and re-encode every image")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    print(json.dumps(build(args.full, args.workers), indent=2))
+
+
+if __name__ == "__main__":
+    main()
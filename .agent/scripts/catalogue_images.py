@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+
+DATA_ROOT = Path("data/games")
+PUBLIC_ROOT = Path("public")
+
+DHASH_SIZE = 8
+PHASH_SIZE = 8
+PHASH_SAMPLE = 32
+SSIM_SIZE = (128, 128)
+SSIM_WINDOW = 7
+
+# Near-white pixels (every channel >= this) count as background, matching crop_weapon_whitespace.py.
+WHITE_THRESHOLD = 244
+
+# Name text area on BL-style item cards, as (x0, y0, x1, y1) fractions of the card size.
+NAME_ROI = (0.056, 0.073, 0.317, 0.132)
+NAME_MIN_PIXELS = 40
+NAME_TOP_PIXELS = 120
+NAME_MIN_CONFIDENCE = 0.70
+
+
+def item_image_path(json_path: Path, item: dict) -> Path | None:
+    slug = item.get("slug") or json_path.stem
+    candidates = [json_path.parent / "img" / f"{slug}.png"]
+    image = (item.get("image") or "").strip()
+    if image.startswith("/"):
+        candidates.append(PUBLIC_ROOT / image.lstrip("/"))
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def flatten_alpha(im: Image.Image, background: tuple[int, int, int] = (255, 255, 255)) -> Image.Image:
+    rgba = im.convert("RGBA")
+    canvas = Image.new("RGBA", rgba.size, background + (255,))
+    canvas.alpha_composite(rgba)
+    return canvas.convert("RGB")
+
+
+def dhash(im: Image.Image, size: int = DHASH_SIZE) -> int:
+    small = flatten_alpha(im).convert("L").resize((size + 1, size), Image.LANCZOS)
+    px = list(small.getdata())
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = px[row * (size + 1) + col]
+            right = px[row * (size + 1) + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+
+def dhash_file(path: Path) -> int:
+    with Image.open(path) as im:
+        return dhash(im)
+
+
+def hamming(left: int, right: int) -> int:
+    return (left ^ right).bit_count()
+
+
+def content_bbox(im: Image.Image, threshold: int = WHITE_THRESHOLD) -> tuple[int, int, int, int] | None:
+    r, g, b, a = (np.asarray(channel) for channel in im.convert("RGBA").split())
+    mask = (a != 0) & ((r < threshold) | (g < threshold) | (b < threshold))
+    columns = np.flatnonzero(mask.any(axis=0))
+    rows = np.flatnonzero(mask.any(axis=1))
+    if columns.size == 0:
+        return None
+    return int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1
+
+
+def dominant_color(im: Image.Image, threshold: int = WHITE_THRESHOLD) -> str | None:
+    # Most common 4-bit-per-channel bin among foreground pixels, reported as the mean colour inside that bin.
+    rgba = np.asarray(im.convert("RGBA")).reshape(-1, 4)
+    pixels = rgba[(rgba[:, 3] != 0) & (rgba[:, :3] < threshold).any(axis=1), :3]
+    if pixels.size == 0:
+        return None
+    bins = (pixels >> 4).astype(np.int32)
+    codes = (bins[:, 0] << 8) | (bins[:, 1] << 4) | bins[:, 2]
+    top = np.bincount(codes, minlength=4096).argmax()
+    r, g, b = pixels[codes == top].mean(axis=0).round().astype(int)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def comparable(im: Image.Image) -> Image.Image:
+    # Local renders are whitespace-cropped and sources are not; compare content only, on white, in grey.
+    flat = flatten_alpha(im)
+    box = content_bbox(flat)
+    return (flat.crop(box) if box else flat).convert("L")
+
+
+@lru_cache(maxsize=None)
+def _dct_matrix(size: int) -> np.ndarray:
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    return np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+
+
+def phash(im: Image.Image, size: int = PHASH_SIZE) -> int:
+    gray = im if im.mode == "L" else flatten_alpha(im).convert("L")
+    pixels = np.asarray(gray.resize((PHASH_SAMPLE, PHASH_SAMPLE), Image.LANCZOS), dtype=np.float64)
+    basis = _dct_matrix(PHASH_SAMPLE)
+    low = (basis @ pixels @ basis.T)[:size, :size].ravel()
+    # The DC term only encodes overall brightness; leave it out of the median.
+    bits = low > np.median(low[1:])
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def _box_mean(values: np.ndarray, window: int) -> np.ndarray:
+    # Mean over every window x window block ("valid" positions only), via a summed-area table.
+    table = np.pad(values, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    total = table[window:, window:] - table[:-window, window:] - table[window:, :-window] + table[:-window, :-window]
+    return total / (window * window)
+
+
+def ssim(left: Image.Image, right: Image.Image, size: tuple[int, int] = SSIM_SIZE) -> float:
+    x = np.asarray(left.convert("L").resize(size, Image.LANCZOS), dtype=np.float64)
+    y = np.asarray(right.convert("L").resize(size, Image.LANCZOS), dtype=np.float64)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    mu_x, mu_y = _box_mean(x, SSIM_WINDOW), _box_mean(y, SSIM_WINDOW)
+    var_x = _box_mean(x * x, SSIM_WINDOW) - mu_x * mu_x
+    var_y = _box_mean(y * y, SSIM_WINDOW) - mu_y * mu_y
+    cov = _box_mean(x * y, SSIM_WINDOW) - mu_x * mu_y
+    index = ((2 * mu_x * mu_y + c1) * (2 * cov + c2)) / ((mu_x * mu_x + mu_y * mu_y + c1) * (var_x + var_y + c2))
+    return float(index.mean())
+
+
+def rgb_to_hsv(rgb: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Vectorised colorsys.rgb_to_hsv: same float64 operations in the same order, so results match it bit for bit.
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    rangec = maxc - minc
+    chromatic = rangec > 0
+    s = np.divide(rangec, maxc, out=np.zeros_like(maxc), where=chromatic)
+    safe = np.where(chromatic, rangec, 1.0)
+    rc = (maxc - r) / safe
+    gc = (maxc - g) / safe
+    bc = (maxc - b) / safe
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(chromatic, np.mod(h / 6.0, 1.0), 0.0)
+    return h, s, maxc
+
+
+def top_k_stable(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, ties broken by position (what a stable descending sort keeps)."""
+    if scores.size <= k:
+        return np.argsort(-scores, kind="stable")
+    kth = np.partition(scores, scores.size - k)[scores.size - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[: k - above.size]
+    return np.sort(np.concatenate((above, ties)))
+
+
+def classify_name_color(
+    image: Image.Image | Path,
+    roi: tuple[float, float, float, float] = NAME_ROI,
+) -> tuple[str | None, float]:
+    if isinstance(image, Path):
+        if not image.exists():
+            return None, 0.0
+        with Image.open(image) as im:
+            return classify_name_color(im.convert("RGB"), roi)
+
+    image = image.convert("RGB") if image.mode != "RGB" else image
+    width, height = image.size
+    box = (int(width * roi[0]), int(height * roi[1]), int(width * roi[2]), int(height * roi[3]))
+    rgb = np.asarray(image.crop(box), dtype=np.float64).reshape(-1, 3) / 255
+
+    hue, saturation, value = rgb_to_hsv(rgb)
+    keep = (saturation > 0.18) & (value > 0.25)
+    if int(keep.sum()) < NAME_MIN_PIXELS:
+        return None, 0.0
+
+    scores = (saturation * value)[keep]
+    top = hue[keep][top_k_stable(scores, NAME_TOP_PIXELS)]
+
+    buckets = {
+        "purple": int(((top >= 0.72) & (top <= 0.92)).sum()),
+        "blue": int(((top >= 0.52) & (top < 0.72)).sum()),
+        "green": int(((top >= 0.23) & (top < 0.52)).sum()),
+        "orange": int(((top < 0.17) | (top > 0.95)).sum()),
+    }
+
+    dominant = max(buckets, key=buckets.get)
+    confidence = buckets[dominant] / top.size
+    if confidence < NAME_MIN_CONFIDENCE:
+        return None, confidence
+    return dominant, confidence
+
+
+def classify_name_colors(paths: list[Path], workers: int = 8) -> dict[Path, tuple[str | None, float]]:
+    # Decoding and the numpy passes release the GIL, so threads are enough for a whole category in well under a second.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(paths, executor.map(classify_name_color, paths)))
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import argparse
+import os
 import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 
+from image_manifest import ImageManifest
+
 
 ROOT = Path("/Users/keogh/Sites/thekeogh/borderlens")
 WORK_DIR = ROOT / ".agent/worked"
@@ -16,41 +23,23 @@ WHITE_THRESHOLD = 244
 MARGIN = 1
 
 
-def is_foreground(pixel: tuple[int, int, int, int]) -> bool:
-    r, g, b, a = pixel
-    if a == 0:
-        return False
-    return min(r, g, b) < WHITE_THRESHOLD
+def foreground_mask(im: Image.Image) -> np.ndarray:
+    # Per-channel planes keep every comparison contiguous; min(r, g, b) < T is the same as any channel < T.
+    r, g, b, a = (np.asarray(channel) for channel in (im if im.mode == "RGBA" else im.convert("RGBA")).split())
+    return (a != 0) & ((r < WHITE_THRESHOLD) | (g < WHITE_THRESHOLD) | (b < WHITE_THRESHOLD))
 
 
 def crop_box(im: Image.Image) -> tuple[int, int, int, int]:
-    px = im.load()
+    mask = foreground_mask(im)
     width, height = im.size
 
-    left = 0
-    while left < width:
-        if any(is_foreground(px[left, y]) for y in range(height)):
-            break
-        left += 1
-
-    right = width - 1
-    while right >= 0:
-        if any(is_foreground(px[right, y]) for y in range(height)):
-            break
-        right -= 1
-
-    top = 0
-    while top < height:
-        if any(is_foreground(px[x, top]) for x in range(width)):
-            break
-        top += 1
-
-    bottom = height - 1
-    while bottom >= 0:
-        if any(is_foreground(px[x, bottom]) for x in range(width)):
-            break
-        bottom -= 1
+    columns = np.flatnonzero(mask.any(axis=0))
+    rows = np.flatnonzero(mask.any(axis=1))
+    if columns.size == 0 or rows.size == 0:
+        raise RuntimeError("no foreground detected")
 
+    left, right = int(columns[0]), int(columns[-1])
+    top, bottom = int(rows[0]), int(rows[-1])
     if left >= right or top >= bottom:
         raise RuntimeError("no foreground detected")
 
@@ -62,19 +51,87 @@ def crop_box(im: Image.Image) -> tuple[int, int, int, int]:
     )
 
 
+def manifest_result(manifest: ImageManifest, path: Path) -> tuple[str, bool] | None:
+    # The manifest bbox uses the same foreground test as foreground_mask, so an unchanged catalogue image
+    # whose content already reaches (within MARGIN) every edge needs neither a decode nor a rewrite.
+    entry = manifest.current(path)
+    if entry is None:
+        return None
+    if entry["bbox"] is None:
+        return f"{path}: no foreground detected", False
+    left, top, right, bottom = entry["bbox"]
+    width, height = entry["width"], entry["height"]
+    if left <= MARGIN and top <= MARGIN and right >= width - MARGIN and bottom >= height - MARGIN:
+        return f"{path.name}: ({width}, {height}) already cropped", True
+    return None
+
+
+def crop_file(task: tuple[Path, Path]) -> str:
+    path, backup_path = task
+    if not backup_path.exists():
+        shutil.copy2(path, backup_path)
+
+    with Image.open(path) as im:
+        rgba = im.convert("RGBA")
+        box = crop_box(rgba)
+        cropped = rgba.crop(box)
+        cropped.save(path)
+        return f"{path.name}: {im.size} -> {cropped.size} box={box}"
+
+
+def run_crop(task: tuple[Path, Path]) -> tuple[str, bool]:
+    try:
+        return crop_file(task), True
+    except Exception as error:
+        return f"{task[0]}: {error}", False
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dirs", nargs="*", type=Path, help=f"Directories of PNGs to crop in place (default: {WORK_DIR})")
+    parser.add_argument(
+        "--backup-dir",
+        type=Path,
+        default=BACKUP_DIR,
+        help="Originals are copied here once, before their first crop (one subdirectory per input when several are given)",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    return parser.parse_args()
+
+
 def main() -> None:
-    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-    for path in sorted(WORK_DIR.glob("*.png")):
-        backup_path = BACKUP_DIR / path.name
-        if not backup_path.exists():
-            shutil.copy2(path, backup_path)
-
-        with Image.open(path) as im:
-            rgba = im.convert("RGBA")
-            box = crop_box(rgba)
-            cropped = rgba.crop(box)
-            cropped.save(path)
-            print(f"{path.name}: {im.size} -> {cropped.size} box={box}")
+    args = parse_args()
+    dirs = args.dirs or [WORK_DIR]
+
+    names = [directory.name for directory in dirs]
+    if len(dirs) > 1 and len(set(names)) != len(names):
+        raise SystemExit("input directories must have distinct names so their backups do not collide")
+
+    manifest = ImageManifest.load()
+    tasks: list[tuple[Path, Path]] = []
+    known: list[tuple[str, bool] | None] = []
+    for directory in dirs:
+        backup_dir = args.backup_dir if len(dirs) == 1 else args.backup_dir / directory.name
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        for path in sorted(directory.glob("*.png")):
+            known.append(manifest_result(manifest, path))
+            if known[-1] is None:
+                tasks.append((path, backup_dir / path.name))
+
+    workers = max(1, min(args.workers, len(tasks) or 1))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            cropped = iter(list(executor.map(run_crop, tasks, chunksize=8)))
+    else:
+        cropped = iter([run_crop(task) for task in tasks])
+    results = [result if result is not None else next(cropped) for result in known]
+
+    failed = 0
+    for line, ok in results:
+        print(line if ok else f"FAILED {line}")
+        failed += int(not ok)
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
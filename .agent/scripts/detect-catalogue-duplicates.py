@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+from catalogue_images import DATA_ROOT, dhash_file, item_image_path, sha256_file
+
+REPORT_PATH = Path(".agent/reports/catalogue-duplicates-report.json")
+
+# Blocks larger than this are almost always generic keys (shared placeholder art, archetype names) rather than
+# duplicates; they are reported separately instead of being expanded pairwise.
+MAX_BLOCK_SIZE = 12
+
+
+@dataclass
+class Record:
+    key: str
+    game: str
+    category: str
+    slug: str
+    name: str
+    file: str
+    blocking_keys: Set[str] = field(default_factory=set)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-images", action="store_true", help="Skip image hash blocking keys")
+    parser.add_argument("--max-block", type=int, default=MAX_BLOCK_SIZE, help="Largest block expanded into pairs")
+    return parser.parse_args()
+
+
+def normalize_name(value: str) -> str:
+    value = value.lower()
+    value = re.sub(r"\s*\((class mod|borderlands 2|borderlands|weapon|shield|grenade mod|relic)\)\s*", "", value)
+    value = value.replace("&", "and")
+    return re.sub(r"[^a-z0-9]+", "", value)
+
+
+def normalize_url(value: str) -> str:
+    parsed = urlparse(value.strip())
+    host = parsed.netloc.lower().removeprefix("www.")
+    path = unquote(parsed.path).replace(" ", "_").rstrip("/").lower()
+    return f"{host}{path}"
+
+
+def blocking_keys(path: Path, item: dict, with_images: bool) -> Set[str]:
+    keys: Set[str] = set()
+
+    slug = item.get("slug") or path.stem
+    keys.add(f"slug:{slug}")
+
+    for name in [item.get("name") or ""] + list(item.get("aliases") or []):
+        normalized = normalize_name(name)
+        if normalized:
+            keys.add(f"name:{normalized}")
+
+    resources = item.get("resources") or {}
+    for source in ("lootlemon", "wiki"):
+        url = (resources.get(source) or "").strip()
+        if url:
+            keys.add(f"{source}:{normalize_url(url)}")
+
+    if with_images:
+        image_path = item_image_path(path, item)
+        if image_path is not None:
+            keys.add(f"image-sha256:{sha256_file(image_path)}")
+            keys.add(f"image-dhash:{dhash_file(image_path):016x}")
+
+    return keys
+
+
+def scope(left: Record, right: Record) -> str:
+    if left.game != right.game:
+        return "cross-game"
+    if left.category != right.category:
+        return "cross-category"
+    return "same-category"
+
+
+def main() -> None:
+    args = parse_args()
+
+    records: Dict[str, Record] = {}
+    blocks: Dict[str, List[str]] = defaultdict(list)
+    failures: List[Dict[str, str]] = []
+
+    for path in sorted(DATA_ROOT.glob("*/*/*.json")):
+        game, category = path.parent.parent.name, path.parent.name
+        try:
+            item = json.loads(path.read_text(encoding="utf-8"))
+            slug = item.get("slug") or path.stem
+            record = Record(
+                key=f"{game}/{category}/{slug}",
+                game=game,
+                category=category,
+                slug=slug,
+                name=item.get("name") or "",
+                file=str(path),
+                blocking_keys=blocking_keys(path, item, not args.no_images),
+            )
+        except Exception as error:
+            failures.append({"file": str(path), "error": str(error)})
+            continue
+
+        records[record.key] = record
+        for key in record.blocking_keys:
+            blocks[key].append(record.key)
+
+    pair_reasons: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+    oversized: List[dict] = []
+
+    for key, members in blocks.items():
+        if len(members) < 2:
+            continue
+        if len(members) > args.max_block:
+            oversized.append({"key": key, "size": len(members), "members": members[:20]})
+            continue
+        kind = key.split(":", 1)[0]
+        for i, left in enumerate(members):
+            for right in members[i + 1 :]:
+                pair_reasons[(left, right) if left < right else (right, left)].add(kind)
+
+    candidates: List[dict] = []
+    for (left_key, right_key), reasons in pair_reasons.items():
+        left, right = records[left_key], records[right_key]
+        candidates.append({
+            "left": left.file,
+            "right": right.file,
+            "left_name": left.name,
+            "right_name": right.name,
+            "scope": scope(left, right),
+            "reasons": sorted(reasons),
+        })
+
+    # Strongest evidence first: more agreeing keys, then same-category before cross-game.
+    scope_rank = {"same-category": 0, "cross-category": 1, "cross-game": 2}
+    candidates.sort(key=lambda entry: (-len(entry["reasons"]), scope_rank[entry["scope"]], entry["left"], entry["right"]))
+
+    by_scope: Dict[str, int] = defaultdict(int)
+    for candidate in candidates:
+        by_scope[candidate["scope"]] += 1
+
+    report = {
+        "completedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "items": len(records),
+        "blocks": len(blocks),
+        "candidates": len(candidates),
+        "candidates_by_scope": dict(sorted(by_scope.items())),
+        "merge_candidates": candidates,
+        "oversized_blocks": sorted(oversized, key=lambda entry: entry["size"], reverse=True),
+        "failed": len(failures),
+        "failures": failures[:100],
+    }
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+
+    print("\n".join([
+        f"Items: {report['items']}",
+        f"Blocks: {report['blocks']}",
+        f"Merge candidates: {report['candidates']} {report['candidates_by_scope']}",
+        f"Oversized blocks: {len(oversized)}",
+        f"Report: {REPORT_PATH}",
+    ]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+import numpy as np
+import requests
+from bs4 import BeautifulSoup
+
+USER_AGENT = {"user-agent": "Mozilla/5.0 (compatible; BorderlensBot/1.0)"}
+WIKI_API_URL = "https://borderlands.fandom.com/api.php"
+
+DATA_ROOT = Path("data/games")
+INDEX_PATH = Path(".agent/index/narrative-minhash.json")
+SOURCE_CACHE_DIR = Path(".agent/temp/narrative-sources")
+REPORT_PATH = Path(".agent/reports/narrative-duplicates-report.json")
+
+NARRATIVE_FIELDS = ["description", "notes", "special.description"]
+SOURCE_FIELDS = ["lootlemon", "wiki"]
+
+SHINGLE_SIZE = 4
+NUM_PERM = 128
+SEED = 1729
+
+# Band/row split is chosen per run from --threshold; candidates are verified against the full signature, so a
+# missed pair costs more than an extra candidate.
+FALSE_NEGATIVE_WEIGHT = 0.8
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+_rng = np.random.RandomState(SEED)
+PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threshold", type=float, default=0.5, help="Minimum estimated Jaccard between narratives")
+    parser.add_argument(
+        "--source-threshold",
+        type=float,
+        default=0.5,
+        help="Minimum share of a narrative's shingles that also occur in one cached source text",
+    )
+    parser.add_argument("--fetch-sources", action="store_true", help="Fetch and cache missing Lootlemon/wiki text")
+    parser.add_argument("--full", action="store_true", help="Ignore the stored index and re-hash everything")
+    return parser.parse_args()
+
+
+def fetch_text(url: str, params: Optional[Dict[str, str]] = None) -> str:
+    response = requests.get(url, params=params, headers=USER_AGENT, timeout=30)
+    response.raise_for_status()
+    return response.text
+
+
+def clean_space(value: str) -> str:
+    return re.sub(r"\s+", " ", value or "").strip()
+
+
+def field_value(item: dict, field: str) -> str:
+    value: object = item
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return ""
+        value = value.get(part)
+    return value if isinstance(value, str) else ""
+
+
+def shingles(text: str) -> Set[str]:
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return set()
+    return {" ".join(words[i : i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(tokens: Set[str]) -> np.ndarray:
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little") for token in tokens),
+        dtype=np.uint64,
+        count=len(tokens),
+    )
+    permuted = (hashes[None, :] * PERM_A[:, None] + PERM_B[:, None]) % MERSENNE_PRIME
+    return (permuted & MAX_HASH).min(axis=1)
+
+
+def digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def iter_items() -> Iterator[Tuple[str, dict]]:
+    for path in sorted(DATA_ROOT.glob("*/*/*.json")):
+        game, category = path.parent.parent.name, path.parent.name
+        item = json.loads(path.read_text(encoding="utf-8"))
+        slug = item.get("slug") or path.stem
+        yield f"{game}/{category}/{slug}", item
+
+
+def source_cache_path(item_key: str) -> Path:
+    return SOURCE_CACHE_DIR / f"{item_key}.json"
+
+
+def scrape_lootlemon_text(url: str) -> str:
+    soup = BeautifulSoup(fetch_text(url), "html.parser")
+    chunks: List[str] = []
+    for selector in (
+        ".w-tab-pane[data-w-tab='Details'] .margin-left.w-embed p",
+        ".w-tab-pane[data-w-tab='Details'] .framed-txt .w-richtext",
+    ):
+        for node in soup.select(selector):
+            text = clean_space(node.get_text(" ", strip=True))
+            if text:
+                chunks.append(text)
+    return "\n".join(chunks)
+
+
+def scrape_wiki_text(url: str) -> str:
+    title = unquote(url.split("/wiki/")[-1]).replace("_", " ")
+    payload = json.loads(fetch_text(
+        WIKI_API_URL,
+        {
+            "action": "parse",
+            "page": title,
+            "prop": "text",
+            "format": "json",
+            "formatversion": "2",
+            "redirects": "1",
+        },
+    ))
+    soup = BeautifulSoup(payload.get("parse", {}).get("text", ""), "html.parser")
+    chunks = [clean_space(node.get_text(" ", strip=True)) for node in soup.select("p, li")]
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
+def load_source_text(item_key: str, item: dict, fetch: bool, failures: List[Dict[str, str]]) -> Dict[str, str]:
+    path = source_cache_path(item_key)
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    if not fetch:
+        return {}
+
+    resources = item.get("resources") or {}
+    cached: Dict[str, str] = {}
+    for name, scrape in (("lootlemon", scrape_lootlemon_text), ("wiki", scrape_wiki_text)):
+        url = (resources.get(name) or "").strip()
+        if not url:
+            continue
+        try:
+            cached[name] = scrape(url)
+        except Exception as error:
+            failures.append({"item": item_key, "source": name, "error": str(error)})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{json.dumps(cached, indent=2, ensure_ascii=True)}\n", encoding="utf-8")
+    return cached
+
+
+def load_index(full: bool) -> Dict[str, dict]:
+    if full or not INDEX_PATH.exists():
+        return {}
+    payload = json.loads(INDEX_PATH.read_text(encoding="utf-8"))
+    params = payload.get("params") or {}
+    if params != index_params():
+        return {}
+    return payload.get("entries") or {}
+
+
+def index_params() -> Dict[str, int]:
+    return {"shingle_size": SHINGLE_SIZE, "num_perm": NUM_PERM, "seed": SEED}
+
+
+def lsh_params(threshold: float) -> Tuple[int, int]:
+    # A pair with Jaccard s shares a band with probability 1 - (1 - s^rows)^bands. Pick the split whose S-curve
+    # best separates pairs below the threshold (false positives) from pairs above it (false negatives).
+    similarity = np.linspace(0.0, 1.0, 1001)
+    below = similarity < threshold
+    best: Optional[Tuple[float, int, int]] = None
+    for bands in range(1, NUM_PERM + 1):
+        if NUM_PERM % bands:
+            continue
+        rows = NUM_PERM // bands
+        candidate = 1.0 - (1.0 - similarity ** rows) ** bands
+        false_positive = float(candidate[below].mean()) * threshold if below.any() else 0.0
+        false_negative = float((1.0 - candidate[~below]).mean()) * (1.0 - threshold)
+        cost = (1.0 - FALSE_NEGATIVE_WEIGHT) * false_positive + FALSE_NEGATIVE_WEIGHT * false_negative
+        if best is None or cost < best[0]:
+            best = (cost, bands, rows)
+    return best[1], best[2]
+
+
+def lsh_candidates(signatures: Dict[str, np.ndarray], bands: int, rows: int) -> Set[Tuple[str, str]]:
+    buckets: Dict[Tuple[int, bytes], List[str]] = defaultdict(list)
+    for key, signature in signatures.items():
+        for band in range(bands):
+            buckets[(band, signature[band * rows : (band + 1) * rows].tobytes())].append(key)
+
+    pairs: Set[Tuple[str, str]] = set()
+    for keys in buckets.values():
+        if len(keys) < 2:
+            continue
+        for i, left in enumerate(keys):
+            for right in keys[i + 1 :]:
+                pairs.add((left, right) if left < right else (right, left))
+    return pairs
+
+
+def source_copies(
+    narratives: Dict[str, Set[str]],
+    sources: Dict[str, Set[str]],
+    texts: Dict[str, str],
+    threshold: float,
+) -> List[dict]:
+    # Containment |A n B| / |A| rather than Jaccard: a short narrative pasted from a long source page shares
+    # all of its shingles with the page but only a small fraction of the page's.
+    postings: Dict[str, List[str]] = defaultdict(list)
+    for key, tokens in sources.items():
+        for token in tokens:
+            postings[token].append(key)
+
+    copies: List[dict] = []
+    for narrative, tokens in narratives.items():
+        shared: Counter = Counter()
+        for token in tokens:
+            shared.update(postings.get(token, ()))
+        for source, count in shared.items():
+            containment = count / len(tokens)
+            if containment < threshold:
+                continue
+            copies.append({
+                "narrative": narrative,
+                "source": source,
+                "containment": round(containment, 3),
+                "shared_shingles": count,
+                "excerpt": texts[narrative][:160],
+            })
+    return copies
+
+
+def main() -> None:
+    args = parse_args()
+    bands, rows = lsh_params(args.threshold)
+
+    previous = load_index(args.full)
+    entries: Dict[str, dict] = {}
+    signatures: Dict[str, np.ndarray] = {}
+    narrative_tokens: Dict[str, Set[str]] = {}
+    source_tokens: Dict[str, Set[str]] = {}
+    texts: Dict[str, str] = {}
+    source_failures: List[Dict[str, str]] = []
+
+    items = 0
+    rehashed = 0
+    reused = 0
+
+    for item_key, item in iter_items():
+        items += 1
+        sources = load_source_text(item_key, item, args.fetch_sources, source_failures)
+        for name in SOURCE_FIELDS:
+            tokens = shingles(clean_space(sources.get(name) or ""))
+            if tokens:
+                source_tokens[f"{item_key}#source:{name}"] = tokens
+
+        for field in NARRATIVE_FIELDS:
+            text = clean_space(field_value(item, field))
+            tokens = shingles(text)
+            if not tokens:
+                continue
+            key = f"{item_key}#{field}"
+            text_digest = digest(text)
+            texts[key] = text
+            narrative_tokens[key] = tokens
+
+            cached = previous.get(key)
+            if cached and cached.get("digest") == text_digest:
+                signature = np.array(cached["signature"], dtype=np.uint64)
+                reused += 1
+            else:
+                signature = minhash(tokens)
+                rehashed += 1
+
+            signatures[key] = signature
+            entries[key] = {"digest": text_digest, "signature": signature.tolist()}
+
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    INDEX_PATH.write_text(json.dumps({"params": index_params(), "entries": entries}), encoding="utf-8")
+
+    candidates = lsh_candidates(signatures, bands, rows)
+    near_duplicates: List[dict] = []
+    for left, right in sorted(candidates):
+        similarity = float(np.mean(signatures[left] == signatures[right]))
+        if similarity < args.threshold:
+            continue
+        near_duplicates.append({
+            "left": left,
+            "right": right,
+            "similarity": round(similarity, 3),
+            "excerpt": texts[left][:160],
+        })
+    copies = source_copies(narrative_tokens, source_tokens, texts, args.source_threshold)
+
+    near_duplicates.sort(key=lambda entry: entry["similarity"], reverse=True)
+    copies.sort(key=lambda entry: entry["containment"], reverse=True)
+
+    report = {
+        "completedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "items": items,
+        "fields_indexed": len(signatures),
+        "rehashed": rehashed,
+        "reused": reused,
+        "sources_indexed": len(source_tokens),
+        "lsh": {"bands": bands, "rows": rows},
+        "lsh_candidates": len(candidates),
+        "near_duplicates": len(near_duplicates),
+        "source_copies": len(copies),
+        "near_duplicate_pairs": near_duplicates,
+        "source_copy_pairs": copies,
+        "source_failures": source_failures[:100],
+    }
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+
+    print("\n".join([
+        f"Items: {items}",
+        f"Fields indexed: {len(signatures)} (re-hashed {rehashed}, reused {reused})",
+        f"LSH candidates: {len(candidates)} ({bands} bands x {rows} rows)",
+        f"Near duplicates: {len(near_duplicates)}",
+        f"Source copies: {len(copies)}",
+        f"Report: {REPORT_PATH}",
+    ]))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,35 +10,14 @@ import requests
 from bs4 import BeautifulSoup
 from PIL import Image
 
+from image_sources import parse_largest_srcset
+
 
 ROOT = Path("/Users/keogh/Sites/thekeogh/borderlens")
 JSON_DIR = ROOT / "data/games/borderlands2/weapons"
 OUT_DIR = ROOT / ".agent/wiki-originals/borderlands2-weapons"
 
 
-def parse_largest_srcset(srcset: str) -> str:
-    best_url = ""
-    best_scale = -1.0
-    for part in srcset.split(","):
-        entry = part.strip()
-        if not entry:
-            continue
-        pieces = entry.split()
-        url = pieces[0]
-        scale = 1.0
-        if len(pieces) > 1 and pieces[1].endswith("x"):
-            try:
-                scale = float(pieces[1][:-1])
-            except ValueError:
-                scale = 1.0
-        if scale > best_scale:
-            best_scale = scale
-            best_url = url
-    if not best_url:
-        raise RuntimeError("no srcset URL found")
-    return best_url
-
-
 def wiki_image_url(page_url: str) -> str:
     parsed = urlparse(page_url)
     title = unquote(parsed.path.rsplit("/", 1)[-1])
@@ -1,15 +1,32 @@
 #!/usr/bin/env python3
+import argparse
 import difflib
+import hashlib
 import json
+import os
 import re
 import subprocess
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from queue import Queue
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Set, Tuple, Union
 
+import numpy as np
 import requests
 from bs4 import BeautifulSoup
 from PIL import Image, ImageEnhance, ImageOps
 
+try:
+    # Registers AVIF decoding on Pillow builds without native AVIF support.
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
 USER_AGENT = {"user-agent": "Mozilla/5.0 (compatible; BorderlensBot/1.0)"}
 
 DATA_ROOT = Path("data/games/borderlands2")
@@ -19,8 +36,108 @@ ASSET_ROOT = Path(".agent/bl2/item-cards")
 RAW_DIR = ASSET_ROOT / "raw"
 PNG_DIR = ASSET_ROOT / "png"
 OCR_DIR = ASSET_ROOT / "ocr"
+OCR_CACHE_DIR = ASSET_ROOT / "ocr-cache"
+CARD_URLS_PATH = ASSET_ROOT / "card-urls.json"
 REPORT_PATH = ASSET_ROOT / "max-abilities-report.json"
 
+CARD_MAX_SIDE = 1800
+CARD_CONTRAST = 2.2
+CARD_THRESHOLDS = (160, 180)
+
+# Stats are OCR'd once on an Otsu-binarised crop. A required stat that is missing or out of range gets its line
+# re-OCR'd on its own first; the fixed-threshold and gray variants only run when tesseract's mean word confidence is
+# below this or the targeted pass could not recover every required stat.
+MIN_STAT_CONFIDENCE = 75.0
+# Readings whose line centre is further than this (px at CARD_MAX_SIDE) from the other variants' get half weight.
+STAT_ROW_TOLERANCE = 24
+# Fields fused below this confidence are listed in the report for review.
+LOW_FIELD_CONFIDENCE = 60.0
+
+# Per-category stat profiles: field -> (low, high, required). Bounds apply to sanitised values (level is 80 + OP).
+STAT_PROFILES: Dict[str, Dict[str, Tuple[float, float, bool]]] = {
+    "weapons": {
+        "level": (1, 90, True),
+        "damage": (1, 1_000_000_000, True),
+        "accuracy": (0, 100, True),
+        "rate": (0.1, 40, True),
+        "reload": (0.3, 10, True),
+        "mag": (1, 2000, True),
+    },
+    "shields": {
+        "level": (1, 90, True),
+        "capacity": (0, 100_000_000, True),
+        "recharge_rate": (1, 100_000_000, True),
+        "recharge_delay": (0.1, 20, True),
+        "absorb_chance": (0, 100, False),
+        "damage": (1, 100_000_000, False),
+    },
+    "grenade-mods": {
+        "level": (1, 90, True),
+        "grenade_damage": (1, 2_000_000_000, True),
+        "grenade_damage_multiplier": (2, 20, False),
+        "blast_radius": (1, 2000, True),
+        "fuse_time": (0, 20, True),
+    },
+    "relics": {
+        "level": (1, 90, True),
+        "cooldown_rate_bonus": (0, 100, False),
+        "gun_damage_bonus": (0, 100, False),
+    },
+    "class-mods": {
+        "level": (1, 90, True),
+        "mag": (0, 100, False),
+        "rate": (0, 100, False),
+        "reload": (0, 100, False),
+        "cooldown_rate_bonus": (0, 100, False),
+        "gun_damage_bonus": (0, 100, False),
+        "weapon_accuracy_bonus": (-100, 100, False),
+    },
+}
+
+# Labels used to find the card line of a stat that did not parse at all.
+STAT_LABELS: Dict[str, Pattern[str]] = {
+    "level": re.compile(r"(level|overpower)\s*requ", re.IGNORECASE),
+    "damage": re.compile(r"^\W*damage\b", re.IGNORECASE),
+    "accuracy": re.compile(r"accura", re.IGNORECASE),
+    "rate": re.compile(r"fire\s*rate", re.IGNORECASE),
+    "reload": re.compile(r"reload", re.IGNORECASE),
+    "mag": re.compile(r"magaz", re.IGNORECASE),
+    "capacity": re.compile(r"capac", re.IGNORECASE),
+    "recharge_rate": re.compile(r"recharge\s*rate", re.IGNORECASE),
+    "recharge_delay": re.compile(r"recharge\s*delay", re.IGNORECASE),
+    "grenade_damage": re.compile(r"(grenade\s*)?damage", re.IGNORECASE),
+    "blast_radius": re.compile(r"blast|radius", re.IGNORECASE),
+    "fuse_time": re.compile(r"fuse", re.IGNORECASE),
+}
+
+# Targeted re-OCR of one stat line: upscaled, single-line psm, thresholds other than the region's Otsu cut.
+REOCR_SCALE = 2
+REOCR_PAD = 6
+REOCR_PSM = 7
+
+# Debug artefacts (per-variant PNGs and OCR text) are only written with --debug-artefacts.
+DEBUG_ARTEFACTS = False
+
+# OCR text is cached by card content plus everything that can change it; --no-ocr-cache bypasses reads.
+OCR_CACHE = True
+# Bump whenever OCR behaviour changes in a way the tunables in ocr_cache_key() do not capture (region splitting,
+# retry rules, output format), so stale cached text is never served.
+OCR_CACHE_VERSION = 1
+
+# Card layout detection (projection profiles over the resized card). Pixel values assume CARD_MAX_SIDE.
+CARD_LAYOUT = True
+LAYOUT_INK_DELTA = 60
+LAYOUT_MIN_BAND = 6
+LAYOUT_PAD = 8
+LAYOUT_STAT_GAP = 0.08
+LAYOUT_RED_SHARE = 0.35
+LAYOUT_FOOTER_SHARE = 0.12
+
+# Stat rows are label/value pairs of mixed sizes (psm 4: single column, variable sizes); the bullet block is
+# uniform running text (psm 6: single block).
+STAT_PSM = 4
+BULLET_PSM = 6
+
 MANUFACTURERS = {
     "ANSHIN",
     "ATLAS",
@@ -39,11 +156,16 @@ MANUFACTURERS = {
     "SCAV",
 }
 
+MANUFACTURER_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(name) for name in sorted(MANUFACTURERS, key=len, reverse=True)) + r")\b"
+)
+
 
 def ensure_dirs() -> None:
     RAW_DIR.mkdir(parents=True, exist_ok=True)
     PNG_DIR.mkdir(parents=True, exist_ok=True)
     OCR_DIR.mkdir(parents=True, exist_ok=True)
+    OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def fetch_text(url: str) -> str:
@@ -70,63 +192,551 @@ def parse_item_card_url(lootlemon_url: str) -> Optional[str]:
     return src or None
 
 
-def run_tesseract(path: Path) -> str:
-    return subprocess.run(
-        ["tesseract", str(path), "stdout", "--psm", "6"],
-        check=True,
-        capture_output=True,
-        text=True,
-    ).stdout
+class SubprocessTesseract:
+    name = "subprocess"
+
+    def ocr(self, image: Image.Image, psm: int = 6) -> str:
+        # Pipe the image over stdin so no intermediate file is needed per variant.
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        return subprocess.run(
+            ["tesseract", "stdin", "stdout", "--psm", str(psm)],
+            input=buffer.getvalue(),
+            check=True,
+            capture_output=True,
+        ).stdout.decode("utf-8", errors="replace")
+
+    def ocr_tsv(self, image: Image.Image, psm: int = 6) -> str:
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        return subprocess.run(
+            ["tesseract", "stdin", "stdout", "--psm", str(psm), "tsv"],
+            input=buffer.getvalue(),
+            check=True,
+            capture_output=True,
+        ).stdout.decode("utf-8", errors="replace")
+
+
+class TesserocrEngine:
+    name = "tesserocr"
+
+    def __init__(self) -> None:
+        import tesserocr
+
+        # One initialised API per process: the language model is loaded once, not once per variant.
+        self.api = tesserocr.PyTessBaseAPI(lang="eng", psm=tesserocr.PSM.SINGLE_BLOCK)
+
+    def ocr(self, image: Image.Image, psm: int = 6) -> str:
+        self.api.SetPageSegMode(psm)
+        self.api.SetImage(image)
+        return self.api.GetUTF8Text()
+
+    def ocr_tsv(self, image: Image.Image, psm: int = 6) -> str:
+        self.api.SetPageSegMode(psm)
+        self.api.SetImage(image)
+        return "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n" + (
+            self.api.GetTSVText(0)
+        )
+
+
+@dataclass
+class OcrWord:
+    text: str
+    confidence: float
+    box: Tuple[int, int, int, int]
+    line: Tuple[int, int, int]
+
+
+def parse_tsv_words(tsv: str) -> List[OcrWord]:
+    words: List[OcrWord] = []
+    for row in tsv.splitlines()[1:]:
+        columns = row.split("\t")
+        # Only word rows (level 5) carry text and a confidence; -1 marks layout rows.
+        if len(columns) < 12 or columns[0] != "5" or not columns[11].strip():
+            continue
+        left, top, width, height = (int(value) for value in columns[6:10])
+        words.append(OcrWord(
+            text=columns[11].strip(),
+            confidence=float(columns[10]),
+            box=(left, top, left + width, top + height),
+            line=(int(columns[2]), int(columns[3]), int(columns[4])),
+        ))
+    return words
+
+
+def group_word_lines(words: List[OcrWord]) -> List[Dict[str, object]]:
+    # Rebuild lines by (block, paragraph, line) in reading order, like tesseract's plain-text output.
+    grouped: Dict[Tuple[int, int, int], List[OcrWord]] = {}
+    for word in words:
+        grouped.setdefault(word.line, []).append(word)
+    lines: List[Dict[str, object]] = []
+    for members in grouped.values():
+        lines.append({
+            "text": " ".join(word.text for word in members),
+            "confidence": round(sum(word.confidence for word in members) / len(members), 1),
+            "top": min(word.box[1] for word in members),
+            "bottom": max(word.box[3] for word in members),
+            "words": [[word.text, word.confidence, *word.box] for word in members],
+        })
+    return lines
+
+
+def line_texts(lines: List[Dict[str, object]]) -> str:
+    return "\n".join(str(line["text"]) for line in lines)
+
+
+OCR_BACKENDS = ["auto", "tesserocr", "subprocess"]
+OCR_BACKEND = "auto"
+_ocr_engine: Optional[Union[TesserocrEngine, SubprocessTesseract]] = None
+
+
+def resolve_ocr_backend(name: str) -> str:
+    if name != "auto":
+        return name
+    try:
+        import tesserocr  # noqa: F401
+    except ImportError:
+        return "subprocess"
+    return "tesserocr"
+
+
+def configure_ocr(backend: str, debug_artefacts: bool = False, card_layout: bool = True, ocr_cache: bool = True) -> None:
+    global OCR_BACKEND, DEBUG_ARTEFACTS, CARD_LAYOUT, OCR_CACHE, _ocr_engine
+    OCR_BACKEND = backend
+    DEBUG_ARTEFACTS = debug_artefacts
+    CARD_LAYOUT = card_layout
+    OCR_CACHE = ocr_cache
+    _ocr_engine = None
+
+
+def ocr_engine() -> Union[TesserocrEngine, SubprocessTesseract]:
+    global _ocr_engine
+    if _ocr_engine is None:
+        if resolve_ocr_backend(OCR_BACKEND) == "tesserocr":
+            _ocr_engine = TesserocrEngine()
+        else:
+            _ocr_engine = SubprocessTesseract()
+    return _ocr_engine
 
 
-def ocr_image(card_url: str, slug: str) -> Tuple[Dict[str, str], Path]:
-    ext = Path(card_url.split("?")[0]).suffix.lower() or ".img"
-    raw_path = RAW_DIR / f"{slug}{ext}"
-    png_path = PNG_DIR / f"{slug}.png"
+def run_tesseract(image: Image.Image, psm: int = 6) -> str:
+    return ocr_engine().ocr(image, psm=psm)
 
-    raw_path.write_bytes(fetch_bytes(card_url))
 
-    subprocess.run(
-        ["sips", "-s", "format", "png", str(raw_path), "--out", str(png_path)],
-        check=True,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
+def run_tesseract_lines(image: Image.Image, psm: int = 6) -> List[Dict[str, object]]:
+    return group_word_lines(parse_tsv_words(ocr_engine().ocr_tsv(image, psm=psm)))
+
+
+@lru_cache(maxsize=None)
+def tesseract_version(backend: str) -> str:
+    if backend == "tesserocr":
+        import tesserocr
+
+        return tesserocr.tesseract_version().splitlines()[0].strip()
+    output = subprocess.run(["tesseract", "--version"], check=True, capture_output=True).stdout
+    return output.decode("utf-8", errors="replace").splitlines()[0].strip()
+
+
+def ocr_cache_key(data: bytes, category: str) -> str:
+    backend = resolve_ocr_backend(OCR_BACKEND)
+    params = {
+        "version": OCR_CACHE_VERSION,
+        "min_stat_confidence": MIN_STAT_CONFIDENCE,
+        "profile": STAT_PROFILES.get(category, {}),
+        "reocr": [REOCR_SCALE, REOCR_PAD, REOCR_PSM, sorted(STAT_LABELS)],
+        "backend": backend,
+        "tesseract": tesseract_version(backend),
+        "max_side": CARD_MAX_SIDE,
+        "contrast": CARD_CONTRAST,
+        "thresholds": list(CARD_THRESHOLDS),
+        "layout": CARD_LAYOUT and [LAYOUT_INK_DELTA, LAYOUT_MIN_BAND, LAYOUT_PAD, LAYOUT_STAT_GAP, LAYOUT_RED_SHARE, LAYOUT_FOOTER_SHARE],
+        "psm": [STAT_PSM, BULLET_PSM],
+    }
+    digest = hashlib.sha256(data)
+    digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def read_ocr_cache(key: str) -> Optional[Dict[str, object]]:
+    path = OCR_CACHE_DIR / f"{key}.json"
+    if not OCR_CACHE or not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_ocr_cache(key: str, texts: Dict[str, object]) -> None:
+    path = OCR_CACHE_DIR / f"{key}.json"
+    # Workers may OCR byte-identical cards at the same time; replace() keeps readers from seeing a partial file.
+    partial = path.with_suffix(f".{os.getpid()}.tmp")
+    partial.write_text(json.dumps(texts), encoding="utf-8")
+    partial.replace(path)
+
+
+def decode_image(data: bytes) -> Image.Image:
+    with Image.open(BytesIO(data)) as image:
+        image.load()
+        return image.convert("RGB")
+
+
+def fit_longest_side(image: Image.Image, size: int) -> Image.Image:
+    # Same contract as `sips -Z`: scale (up or down) so the longest side equals `size`.
+    longest = max(image.size)
+    if longest == size:
+        return image
+    scale = size / longest
+    return image.resize(
+        (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+        Image.LANCZOS,
     )
-    subprocess.run(
-        ["sips", "-Z", "1800", str(png_path), "--out", str(png_path)],
-        check=True,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
+
+
+def preprocess_card(data: bytes) -> Tuple[Image.Image, Image.Image]:
+    image = fit_longest_side(decode_image(data), CARD_MAX_SIDE)
+    gray = ImageEnhance.Contrast(ImageOps.grayscale(image)).enhance(CARD_CONTRAST)
+    return image, gray
+
+
+def binarise(image: Image.Image, threshold: int) -> Image.Image:
+    return image.point(lambda p, cut=threshold: 255 if p > cut else 0)
+
+
+def otsu_threshold(image: Image.Image) -> int:
+    histogram = np.bincount(np.asarray(image, dtype=np.uint8).ravel(), minlength=256).astype(np.float64)
+    probability = histogram / max(histogram.sum(), 1.0)
+    omega = np.cumsum(probability)
+    mu = np.cumsum(probability * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (mu[-1] * omega - mu) ** 2 / (omega * (1.0 - omega))
+    return int(np.argmax(np.nan_to_num(between)))
+
+
+Box = Tuple[int, int, int, int]
+# A reading is (value, line confidence 0-100, line centre y).
+StatReading = Tuple[float, float, float]
+
+
+@dataclass
+class CardLayout:
+    name: Box
+    stats: Box
+    bullets: Optional[Box]
+    red_text: Optional[Box]
+    footer: Optional[Box]
+
+    def as_dict(self) -> Dict[str, Optional[List[int]]]:
+        return {key: list(value) if value else None for key, value in self.__dict__.items()}
+
+
+def ink_bands(profile: np.ndarray, min_ink: int) -> List[Tuple[int, int]]:
+    rows = (profile >= min_ink).astype(np.int8)
+    # Rising and falling edges of the padded row mask give half-open [top, bottom) runs.
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], rows, [0]))))
+    return [(int(top), int(bottom)) for top, bottom in zip(edges[::2], edges[1::2]) if bottom - top >= LAYOUT_MIN_BAND]
+
+
+def widest_blank_run(columns: np.ndarray) -> int:
+    ink = np.flatnonzero(columns)
+    if ink.size < 2:
+        return 0
+    return int(np.diff(ink).max()) - 1
+
+
+def union_box(bands: List[Tuple[int, int]], ink: np.ndarray) -> Optional[Box]:
+    if not bands:
+        return None
+    top, bottom = bands[0][0], bands[-1][1]
+    columns = np.flatnonzero(ink[top:bottom].any(axis=0))
+    height, width = ink.shape
+    return (
+        max(0, int(columns[0]) - LAYOUT_PAD),
+        max(0, top - LAYOUT_PAD),
+        min(width, int(columns[-1]) + 1 + LAYOUT_PAD),
+        min(height, bottom + LAYOUT_PAD),
+    )
+
+
+def detect_card_layout(image: Image.Image) -> Optional[CardLayout]:
+    pixels = np.asarray(image, dtype=np.int16)
+    gray = pixels.mean(axis=2)
+    ink = np.abs(gray - np.median(gray)) > LAYOUT_INK_DELTA
+    # Frame rules and full-bleed art span (almost) the whole card; they carry no text and would merge bands.
+    ink[ink.mean(axis=1) > 0.9, :] = False
+    ink[:, ink.mean(axis=0) > 0.9] = False
+
+    height, width = ink.shape
+    bands = ink_bands(ink.sum(axis=1), max(2, width // 500))
+    if len(bands) < 3:
+        return None
+
+    red, green, blue = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+    red_ink = ink & (red > 150) & (red * 10 > green * 16) & (red * 10 > blue * 16)
+
+    name_band, rest = bands[0], bands[1:]
+    footer = [band for band in rest if band[0] >= height * (1 - LAYOUT_FOOTER_SHARE)]
+    red_text = [
+        band for band in rest
+        if band not in footer and red_ink[band[0]:band[1]].sum() >= LAYOUT_RED_SHARE * max(1, ink[band[0]:band[1]].sum())
+    ]
+    body = [band for band in rest if band not in footer and band not in red_text]
+    if red_text:
+        body = [band for band in body if band[1] <= red_text[0][0]]
+    if not body:
+        return None
+
+    # Stat rows are label ... value pairs with a wide blank run between them; ability bullets are running text.
+    # Only the trailing run of text-like bands is the bullet list: many cards have no bullets at all, and their
+    # last stat rows must stay in the stat region however far below the others they sit.
+    stat_rows = [widest_blank_run(ink[top:bottom].any(axis=0)) >= LAYOUT_STAT_GAP * width for top, bottom in body]
+    if not any(stat_rows):
+        return None
+    split = len(stat_rows) - stat_rows[::-1].index(True)
+    stat_bands, bullet_bands = body[:split], body[split:]
+
+    return CardLayout(
+        name=union_box([name_band], ink),
+        stats=union_box(stat_bands, ink),
+        bullets=union_box(bullet_bands, ink),
+        red_text=union_box(red_text, ink),
+        footer=union_box(footer, ink),
     )
 
-    image = Image.open(png_path).convert("RGB")
-    gray = ImageOps.grayscale(image)
-    gray = ImageEnhance.Contrast(gray).enhance(2.2)
-
-    gray_path = PNG_DIR / f"{slug}-gray.png"
-    bw160_path = PNG_DIR / f"{slug}-bw160.png"
-    bw180_path = PNG_DIR / f"{slug}-bw180.png"
-
-    gray.save(gray_path)
-    gray.point(lambda p: 255 if p > 160 else 0).save(bw160_path)
-    gray.point(lambda p: 255 if p > 180 else 0).save(bw180_path)
-
-    ocr_gray = run_tesseract(gray_path)
-    ocr_bw160 = run_tesseract(bw160_path)
-    ocr_bw180 = run_tesseract(bw180_path)
-
-    ocr_path = OCR_DIR / f"{slug}.txt"
-    ocr_path.write_text(
-        "\n\n=== gray ===\n"
-        + ocr_gray
-        + "\n\n=== bw160 ===\n"
-        + ocr_bw160
-        + "\n\n=== bw180 ===\n"
-        + ocr_bw180,
+
+def write_debug_artefacts(slug: str, variants: Dict[str, Image.Image], texts: Dict[str, str]) -> None:
+    for name, image in variants.items():
+        image.save(PNG_DIR / f"{slug}-{name}.png")
+    (OCR_DIR / f"{slug}.txt").write_text(
+        "".join(f"\n\n=== {name} ===\n{text}" for name, text in texts.items()),
         encoding="utf-8",
     )
 
-    return {"gray": ocr_gray, "bw160": ocr_bw160, "bw180": ocr_bw180}, png_path
+
+def split_lines(text: str) -> List[str]:
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def stat_in_profile(category: str, key: str, value: float) -> bool:
+    bounds = STAT_PROFILES.get(category, {}).get(key)
+    if bounds is None:
+        return True
+    sanitised = sanitise_stats(postprocess_stats({key: value})).get(key)
+    return sanitised is not None and bounds[0] <= sanitised <= bounds[1]
+
+
+def stat_problems(category: str, readings: Dict[str, StatReading]) -> Dict[str, str]:
+    problems: Dict[str, str] = {}
+    for key, (low, high, required) in STAT_PROFILES.get(category, {}).items():
+        if key in readings:
+            if not stat_in_profile(category, key, readings[key][0]):
+                problems[key] = "out-of-range"
+        elif required:
+            problems[key] = "missing"
+    return problems
+
+
+def find_stat_line(lines: List[Dict[str, object]], key: str) -> Optional[Dict[str, object]]:
+    for line in lines:
+        if key in parse_stats([str(line["text"])]):
+            return line
+    label = STAT_LABELS.get(key)
+    if label is None:
+        return None
+    for line in lines:
+        if label.search(str(line["text"])):
+            return line
+    return None
+
+
+def reocr_stat_line(
+    region: Image.Image,
+    line: Dict[str, object],
+    key: str,
+    category: str,
+    skip_threshold: int,
+    images: Dict[str, Image.Image],
+) -> Optional[Dict[str, object]]:
+    # Full region width: the value is right-aligned and may be exactly the part the first pass lost.
+    top = max(0, int(line["top"]) - REOCR_PAD)
+    bottom = min(region.height, int(line["bottom"]) + REOCR_PAD)
+    crop = region.crop((0, top, region.width, bottom))
+    crop = crop.resize((crop.width * REOCR_SCALE, crop.height * REOCR_SCALE), Image.LANCZOS)
+
+    for threshold in [otsu_threshold(crop), *CARD_THRESHOLDS]:
+        if threshold == skip_threshold:
+            continue
+        variant = binarise(crop, threshold)
+        words = [word for found in run_tesseract_lines(variant, psm=REOCR_PSM) for word in found["words"]]
+        if not words:
+            continue
+        text = " ".join(str(word[0]) for word in words)
+        value = parse_stats([text]).get(key)
+        if value is None or not stat_in_profile(category, key, value):
+            continue
+        images[f"reocr-{key}"] = variant
+        return {
+            "text": text,
+            "confidence": round(sum(float(word[1]) for word in words) / len(words), 1),
+            "top": line["top"],
+            "bottom": line["bottom"],
+            "words": words,
+        }
+    return None
+
+
+def ocr_stats(gray: Image.Image, box: Optional[Box], category: str, images: Dict[str, Image.Image]) -> Dict[str, object]:
+    region = gray.crop(box) if box else gray
+    psm = STAT_PSM if box else 6
+
+    threshold = otsu_threshold(region)
+    images["otsu"] = binarise(region, threshold)
+    lines = run_tesseract_lines(images["otsu"], psm=psm)
+    stats = {"otsu": lines}
+
+    words = [word for line in lines for word in line["words"]]
+    confidence = sum(word[1] for word in words) / len(words) if words else 0.0
+
+    problems = stat_problems(category, parse_stat_readings(lines))
+    recovered: List[Dict[str, object]] = []
+    for key in sorted(problems):
+        line = find_stat_line(lines, key)
+        reread = reocr_stat_line(region, line, key, category, threshold, images) if line else None
+        if reread is not None:
+            recovered.append(reread)
+    if recovered:
+        stats["reocr"] = recovered
+    # Out-of-range readings that were re-read successfully are outvoted in fusion; only what is still absent counts.
+    recovered_keys = {key for line in recovered for key in parse_stats([str(line["text"])])}
+    remaining = sorted(key for key, reason in problems.items() if reason == "missing" and key not in recovered_keys)
+
+    fallback: Optional[str] = None
+    if confidence < MIN_STAT_CONFIDENCE:
+        fallback = "low-confidence"
+    elif remaining:
+        fallback = f"missing:{','.join(remaining)}"
+
+    if fallback:
+        images["gray"] = region
+        for cut in CARD_THRESHOLDS:
+            images[f"bw{cut}"] = binarise(region, cut)
+        for name in ["gray"] + [f"bw{cut}" for cut in CARD_THRESHOLDS]:
+            stats[name] = run_tesseract_lines(images[name], psm=psm)
+
+    return {
+        "stats": stats,
+        "stat_confidence": round(confidence, 1),
+        "stat_fallback": fallback,
+        "reocr": {key: {"reason": reason, "recovered": key in recovered_keys} for key, reason in sorted(problems.items())},
+    }
+
+
+def ocr_card(gray: Image.Image, layout: Optional[CardLayout], category: str, images: Dict[str, Image.Image]) -> Dict[str, object]:
+    texts = ocr_stats(gray, layout.stats if layout else None, category, images)
+    if layout is None:
+        texts["bullets"] = line_texts(texts["stats"]["gray"]) if "gray" in texts["stats"] else run_tesseract(gray)
+    elif layout.bullets:
+        texts["bullets"] = run_tesseract(gray.crop(layout.bullets), psm=BULLET_PSM)
+    else:
+        texts["bullets"] = ""
+    texts["layout"] = "regions" if layout else "full"
+    return texts
+
+
+def missing_required_stats(category: str, stats: Dict[str, List[Dict[str, object]]]) -> List[str]:
+    readings: Dict[str, StatReading] = {}
+    for lines in stats.values():
+        readings.update(parse_stat_readings(lines))
+    return sorted(key for key, reason in stat_problems(category, readings).items() if reason == "missing")
+
+
+def supplement_card_stats(
+    gray: Image.Image,
+    texts: Dict[str, object],
+    missing: List[str],
+    category: str,
+    images: Dict[str, Image.Image],
+) -> None:
+    # A stat row the layout left outside the stat region is still on the card. Only lines that read a missing
+    # field are kept: their positions are card coordinates, not region ones, so they must not vote on the rest.
+    card_images: Dict[str, Image.Image] = {}
+    card = ocr_stats(gray, None, category, card_images)
+    for name, lines in card["stats"].items():
+        kept = [line for line in lines if set(parse_stats([str(line["text"])])) & set(missing)]
+        if kept:
+            texts["stats"][f"card-{name}"] = kept
+    images.update({f"card-{name}": image for name, image in card_images.items()})
+    texts["layout"] = "regions+card"
+
+
+def raw_card_path(card_url: str, category: str, slug: str) -> Path:
+    # Slugs repeat across categories (anarchist, devastator), so downloads are kept per category.
+    return RAW_DIR / category / f"{slug}{Path(card_url.split('?')[0]).suffix.lower() or '.img'}"
+
+
+def load_card_bytes(card_url: str, category: str, slug: str, offline: bool) -> bytes:
+    raw_path = raw_card_path(card_url, category, slug)
+    if offline:
+        if not raw_path.exists():
+            raise FileNotFoundError(f"no cached card download {raw_path}")
+        return raw_path.read_bytes()
+    data = fetch_bytes(card_url)
+    raw_path.parent.mkdir(parents=True, exist_ok=True)
+    raw_path.write_bytes(data)
+    return data
+
+
+def ocr_card_bytes(
+    data: bytes,
+    slug: str,
+    category: str,
+    timings: Optional[Dict[str, float]] = None,
+) -> Dict[str, object]:
+    clock = [time.perf_counter()]
+
+    def lap(stage: str) -> None:
+        now = time.perf_counter()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + now - clock[0]
+        clock[0] = now
+
+    image, gray = preprocess_card(data)
+    lap("preprocess")
+    layout = detect_card_layout(image) if CARD_LAYOUT else None
+    lap("layout")
+    images: Dict[str, Image.Image] = {}
+    texts: Optional[Dict[str, object]] = None
+    if layout is not None:
+        texts = ocr_card(gray, layout, category, images)
+        # A mis-segmented card yields neither stats nor bullets; retry on the whole card rather than lose the item.
+        if not any(parse_stats(split_lines(line_texts(lines))) for lines in texts["stats"].values()) and not any(
+            is_bullet_line(line) for line in split_lines(texts["bullets"])
+        ):
+            texts = None
+        else:
+            missing = missing_required_stats(category, texts["stats"])
+            if missing:
+                supplement_card_stats(gray, texts, missing, category, images)
+    if texts is None:
+        layout = None
+        images = {}
+        texts = ocr_card(gray, None, category, images)
+    lap("ocr")
+
+    if DEBUG_ARTEFACTS:
+        debug_texts = {f"stats-{name}": line_texts(lines) for name, lines in texts["stats"].items()}
+        debug_texts["bullets"] = texts["bullets"]
+        debug_texts["layout"] = json.dumps(layout.as_dict() if layout else None)
+        write_debug_artefacts(slug, images, debug_texts)
+    return texts
+
+
+def ocr_image(data: bytes, slug: str, category: str) -> Dict[str, object]:
+    key = ocr_cache_key(data, category)
+    cached = read_ocr_cache(key)
+    if cached is not None:
+        return {**cached, "cache": "hit"}
+
+    texts = ocr_card_bytes(data, slug, category)
+    write_ocr_cache(key, texts)
+    return {**texts, "cache": "miss"}
 
 
 def clean_space(value: str) -> str:
@@ -265,10 +875,7 @@ def looks_like_manufacturer(line: str) -> bool:
         return False
     if upper in MANUFACTURERS:
         return True
-    for manufacturer in MANUFACTURERS:
-        if re.search(rf"\b{re.escape(manufacturer)}\b", upper):
-            return True
-    return False
+    return bool(MANUFACTURER_PATTERN.search(upper))
 
 
 def similar_to_red_text(line: str, red_text: str) -> bool:
@@ -360,7 +967,236 @@ def collect_bullet_lines(lines: List[str]) -> List[str]:
     return out
 
 
-def extract_abilities(lines: List[str], red_text: str) -> List[str]:
+@dataclass
+class AbilityRule:
+    name: str
+    action: str
+    pattern: Optional[Pattern[str]] = None
+    replacement: str = ""
+    categories: Optional[Set[str]] = None
+    only_if: Optional[Pattern[str]] = None
+    unless: Optional[Pattern[str]] = None
+    handler: Optional[Callable[[str, str], Optional[str]]] = None
+    hits: int = 0
+    seconds: float = 0.0
+
+    def applies_to(self, category: str) -> bool:
+        return self.categories is None or category in self.categories
+
+    def apply(self, ability: str, red_text: str) -> Tuple[Optional[str], bool]:
+        if self.only_if is not None and not self.only_if.search(ability):
+            return ability, False
+        if self.unless is not None and self.unless.search(ability):
+            return ability, False
+
+        if self.action == "custom" and self.handler is not None:
+            result = self.handler(ability, red_text)
+            return result, result != ability
+
+        if self.pattern is None:
+            raise ValueError(f"ability rule {self.name} has no pattern")
+        match = self.pattern.search(ability)
+        if not match:
+            return ability, False
+        if self.action == "drop":
+            return None, True
+        if self.action == "replace":
+            return self.replacement, True
+        if self.action == "truncate":
+            return ability[: match.start()].strip(), True
+        if self.action == "sub":
+            result = self.pattern.sub(self.replacement, ability)
+            return result, result != ability
+        raise ValueError(f"unknown ability rule action: {self.action}")
+
+
+@lru_cache(maxsize=None)
+def red_text_words(red_text: str) -> Tuple[str, ...]:
+    return tuple(re.findall(r"[A-Za-z]{4,}", red_text.lower()))
+
+
+def trim_noisy_sentence_tail(ability: str, _red_text: str) -> Optional[str]:
+    if "." not in ability:
+        return ability
+    first, rest = ability.split(".", 1)
+    if len(first) >= 12 and is_probably_noise(rest):
+        return f"{first}."
+    return ability
+
+
+def trim_red_text_tail(ability: str, red_text: str) -> Optional[str]:
+    # OCR occasionally fuses the red text onto the end of a bullet line.
+    lower = ability.lower()
+    for word in red_text_words(red_text):
+        index = lower.find(word)
+        if index > 12:
+            return ability[:index].strip()
+    return ability
+
+
+def trim_manufacturer_bleed(ability: str, _red_text: str) -> Optional[str]:
+    match = MANUFACTURER_PATTERN.search(ability.upper())
+    if match:
+        return ability[: match.start()].strip()
+    return ability
+
+
+def drop_red_text_echo(ability: str, red_text: str) -> Optional[str]:
+    if similar_to_red_text(ability, red_text):
+        return None
+    return ability
+
+
+# Ordered rewrite table for card bullet lines. Rules run top to bottom; a `drop` ends the line.
+ABILITY_RULES: List[AbilityRule] = [
+    AbilityRule(
+        name="immunity-wording",
+        pattern=re.compile(r"grants immunity to .+ damage", re.IGNORECASE),
+        action="replace",
+        replacement="Grants immunity to elemental damage.",
+    ),
+    AbilityRule(
+        name="highly-effective-flesh",
+        pattern=re.compile(r"^highly .+ flesh", re.IGNORECASE),
+        action="replace",
+        replacement="Highly effective vs Flesh.",
+    ),
+    AbilityRule(
+        name="elemental-proc-line",
+        pattern=re.compile(
+            r"(damage\s*/\s*sec|ignite chance|electrocute chance|corrode chance|slag chance)",
+            re.IGNORECASE,
+        ),
+        action="drop",
+    ),
+    AbilityRule(
+        name="absorb-bullets",
+        pattern=re.compile(r"chance to absorb .*bullets", re.IGNORECASE),
+        action="replace",
+        replacement="Chance to Absorb enemy bullets.",
+        categories={"shields"},
+    ),
+    AbilityRule(
+        name="absorbed-ammo-backpack",
+        pattern=re.compile(r"absorbed ammo .*backpack", re.IGNORECASE),
+        action="replace",
+        replacement="Absorbed ammo is added to your backpack.",
+        categories={"shields"},
+    ),
+    AbilityRule(
+        name="skill-tail",
+        pattern=re.compile(r"^(.*?\bSkill)\b.*$", re.IGNORECASE),
+        action="sub",
+        replacement=r"\1",
+        only_if=re.compile(r"skill", re.IGNORECASE),
+    ),
+    AbilityRule(
+        name="noisy-sentence-tail",
+        action="custom",
+        unless=re.compile(r"skill", re.IGNORECASE),
+        handler=trim_noisy_sentence_tail,
+    ),
+    AbilityRule(
+        name="pipe-separator",
+        pattern=re.compile(r"\|"),
+        action="sub",
+        replacement=" ",
+    ),
+    AbilityRule(
+        name="manufacturer-bleed",
+        action="custom",
+        handler=trim_manufacturer_bleed,
+    ),
+    AbilityRule(
+        name="red-text-tail",
+        action="custom",
+        handler=trim_red_text_tail,
+    ),
+    AbilityRule(
+        name="quote-bracket-noise",
+        pattern=re.compile(r"[`'()]{3,}.*$"),
+        action="sub",
+    ),
+    AbilityRule(
+        name="trim-whitespace",
+        pattern=re.compile(r"^\s+|\s+$"),
+        action="sub",
+    ),
+    AbilityRule(
+        name="collapse-whitespace",
+        pattern=re.compile(r"\s{2,}"),
+        action="sub",
+        replacement=" ",
+    ),
+    AbilityRule(
+        name="effective-split",
+        pattern=re.compile(r"\bef\s+fective\b", re.IGNORECASE),
+        action="sub",
+        replacement="effective",
+    ),
+    AbilityRule(
+        name="highly-us-vs",
+        pattern=re.compile(r"\bus\b", re.IGNORECASE),
+        action="sub",
+        replacement="vs",
+        only_if=re.compile(r"^highly", re.IGNORECASE),
+    ),
+    AbilityRule(
+        name="non-ascii-noise",
+        pattern=re.compile(r"[^A-Za-z0-9 .,:%+'/-]"),
+        action="drop",
+    ),
+    AbilityRule(
+        name="red-text-echo",
+        action="custom",
+        handler=drop_red_text_echo,
+    ),
+]
+
+
+def apply_ability_rules(ability: str, red_text: str, category: str) -> Optional[str]:
+    for rule in ABILITY_RULES:
+        if not rule.applies_to(category):
+            continue
+        started = time.perf_counter()
+        result, hit = rule.apply(ability, red_text)
+        rule.seconds += time.perf_counter() - started
+        if hit:
+            rule.hits += 1
+        if result is None:
+            return None
+        ability = result
+    return ability
+
+
+def reset_ability_rule_stats() -> None:
+    for rule in ABILITY_RULES:
+        rule.hits = 0
+        rule.seconds = 0.0
+
+
+def ability_rule_stats() -> Dict[str, Tuple[int, float]]:
+    return {rule.name: (rule.hits, rule.seconds) for rule in ABILITY_RULES}
+
+
+def ability_rule_report(totals: Dict[str, List[float]]) -> Dict[str, object]:
+    ranked = sorted(ABILITY_RULES, key=lambda rule: totals[rule.name][1], reverse=True)
+    return {
+        "rules": [
+            {
+                "name": rule.name,
+                "action": rule.action,
+                "categories": sorted(rule.categories) if rule.categories else "all",
+                "hits": int(totals[rule.name][0]),
+                "seconds": round(totals[rule.name][1], 6),
+            }
+            for rule in ranked
+        ],
+        "never_hit": [rule.name for rule in ABILITY_RULES if totals[rule.name][0] == 0],
+    }
+
+
+def extract_abilities(lines: List[str], red_text: str, category: str) -> List[str]:
     out: List[str] = []
     for raw in collect_bullet_lines(lines):
         ability = clean_space(raw)
@@ -376,56 +1212,7 @@ def extract_abilities(lines: List[str], red_text: str) -> List[str]:
         if similar_to_red_text(ability, red_text):
             continue
 
-        if re.search(r"grants immunity to .+ damage", ability, flags=re.IGNORECASE):
-            ability = "Grants immunity to elemental damage."
-
-        if re.search(r"^highly .+ flesh", ability, flags=re.IGNORECASE):
-            ability = "Highly effective vs Flesh."
-
-        if re.search(r"(damage\s*/\s*sec|ignite chance|electrocute chance|corrode chance|slag chance)", ability, flags=re.IGNORECASE):
-            continue
-
-        if re.search(r"chance to absorb .*bullets", ability, flags=re.IGNORECASE):
-            ability = "Chance to Absorb enemy bullets."
-        if re.search(r"absorbed ammo .*backpack", ability, flags=re.IGNORECASE):
-            ability = "Absorbed ammo is added to your backpack."
-
-        if "skill" in ability.lower():
-            ability = re.sub(r"^(.*?\bSkill)\b.*$", r"\1", ability, flags=re.IGNORECASE)
-        elif "." in ability:
-            first, rest = ability.split(".", 1)
-            if len(first) >= 12 and is_probably_noise(rest):
-                ability = f"{first}."
-
-        ability = ability.replace("|", " ")
-
-        # Remove trailing manufacturer-like bleed.
-        upper = ability.upper()
-        for manufacturer in MANUFACTURERS:
-            match = re.search(rf"\b{re.escape(manufacturer)}\b", upper)
-            if match:
-                ability = ability[: match.start()].strip()
-                break
-
-        # Remove embedded red-text tails if OCR fused them into bullet text.
-        red_words = [word for word in re.findall(r"[A-Za-z]{4,}", red_text.lower())]
-        for word in red_words:
-            index = ability.lower().find(word)
-            if index > 12:
-                ability = ability[:index].strip()
-                break
-
-        ability = re.sub(r"[`'()]{3,}.*$", "", ability).strip()
-        ability = re.sub(r"\s{2,}", " ", ability)
-        ability = re.sub(r"\bef\s+fective\b", "effective", ability, flags=re.IGNORECASE)
-        if ability.lower().startswith("highly"):
-            ability = re.sub(r"\bus\b", "vs", ability, flags=re.IGNORECASE)
-
-        if re.search(r"[^A-Za-z0-9 .,:%+'/-]", ability):
-            continue
-        if similar_to_red_text(ability, red_text):
-            continue
-
+        ability = apply_ability_rules(ability, red_text, category)
         if not ability:
             continue
         if ability not in out:
@@ -440,34 +1227,58 @@ def to_schema_number(value: float) -> float:
     return round(value, 4)
 
 
-def merge_stat_candidates(candidates: List[Dict[str, float]]) -> Dict[str, float]:
-    out: Dict[str, float] = {}
+def parse_stat_readings(lines: List[Dict[str, object]]) -> Dict[str, StatReading]:
+    readings: Dict[str, StatReading] = {}
+    # parse_stats is line-local, so parsing line by line keeps its last-line-wins semantics while tagging each
+    # value with the confidence and position of the line it came from.
+    for line in lines:
+        for key, value in parse_stats([str(line["text"])]).items():
+            readings[key] = (value, float(line["confidence"]), (float(line["top"]) + float(line["bottom"])) / 2)
+    return readings
+
+
+def fuse_stat_readings(candidates: List[Dict[str, StatReading]]) -> Tuple[Dict[str, float], Dict[str, float]]:
+    values_out: Dict[str, float] = {}
+    confidence_out: Dict[str, float] = {}
     keys = sorted({key for candidate in candidates for key in candidate.keys()})
 
     for key in keys:
-        values = [candidate[key] for candidate in candidates if key in candidate]
-        if not values:
+        readings = [candidate[key] for candidate in candidates if key in candidate]
+        if not readings:
             continue
 
-        rounded = [round(value, 4) for value in values]
-        freq: Dict[float, int] = {}
-        for value in rounded:
-            freq[value] = freq.get(value, 0) + 1
-
-        best_count = max(freq.values())
-        winners = [value for value, count in freq.items() if count == best_count]
+        # The label/value row sits at the same height in every variant; a reading from an outlying row is most
+        # likely a different line that happened to parse as this stat, so it counts for less.
+        centres = sorted(reading[2] for reading in readings)
+        median_centre = centres[len(centres) // 2]
+        weights: Dict[float, float] = {}
+        supporters: Dict[float, List[float]] = {}
+        for value, confidence, centre in readings:
+            weight = max(confidence, 1.0) * (1.0 if abs(centre - median_centre) <= STAT_ROW_TOLERANCE else 0.5)
+            rounded = round(value, 4)
+            weights[rounded] = weights.get(rounded, 0.0) + weight
+            supporters.setdefault(rounded, []).append(confidence)
+
+        best_weight = max(weights.values())
+        winners = [value for value, weight in weights.items() if weight == best_weight]
         if len(winners) == 1:
-            out[key] = winners[0]
-            continue
-
-        sorted_values = sorted(values)
-        middle = len(sorted_values) // 2
-        if len(sorted_values) % 2 == 1:
-            out[key] = sorted_values[middle]
+            winner = winners[0]
         else:
-            out[key] = (sorted_values[middle - 1] + sorted_values[middle]) / 2
+            sorted_values = sorted(reading[0] for reading in readings)
+            middle = len(sorted_values) // 2
+            if len(sorted_values) % 2 == 1:
+                winner = sorted_values[middle]
+            else:
+                winner = (sorted_values[middle - 1] + sorted_values[middle]) / 2
 
-    return out
+        values_out[key] = winner
+        # Field confidence: how sure tesseract was of the winning readings, scaled by their share of the vote.
+        agreeing = supporters.get(round(winner, 4), [])
+        share = weights.get(round(winner, 4), 0.0) / sum(weights.values())
+        mean_confidence = sum(agreeing) / len(agreeing) if agreeing else 0.0
+        confidence_out[key] = round(mean_confidence * share, 1)
+
+    return values_out, confidence_out
 
 
 def postprocess_stats(stats: Dict[str, float]) -> Dict[str, float]:
@@ -530,17 +1341,327 @@ def sanitise_stats(stats: Dict[str, float]) -> Dict[str, float]:
     return out
 
 
-def main() -> None:
-    ensure_dirs()
+@dataclass
+class CardJob:
+    index: int
+    category: str
+    path: str
+    slug: str
+    red_text: str
+    lootlemon_url: str
+    card_url: Optional[str] = None
+    offline: bool = False
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Card OCR processes (1 runs OCR in-process)",
+    )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=8,
+        help="Threads fetching Lootlemon pages and card images ahead of OCR",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=0,
+        help="Fetched cards allowed to wait for OCR (default: 2 x workers)",
+    )
+    parser.add_argument(
+        "--ocr-backend",
+        choices=OCR_BACKENDS,
+        default="auto",
+        help="tesserocr keeps one engine per worker; subprocess spawns the tesseract CLI per variant",
+    )
+    parser.add_argument(
+        "--debug-artefacts",
+        action="store_true",
+        help="Write preprocessed variant PNGs and raw OCR text under .agent/bl2/item-cards/{png,ocr}",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Reuse cached card URLs and raw downloads instead of fetching (for re-parsing after rule changes)",
+    )
+    parser.add_argument(
+        "--no-ocr-cache",
+        action="store_true",
+        help="Ignore cached OCR text and re-run tesseract for every card (results are still written back)",
+    )
+    parser.add_argument(
+        "--no-layout",
+        action="store_true",
+        help="OCR the whole card instead of only the detected stat and bullet regions",
+    )
+    return parser.parse_args()
+
+
+def init_worker(backend: str, debug_artefacts: bool, card_layout: bool, ocr_cache: bool) -> None:
+    # Each worker already owns a core; stop tesseract's OpenMP threads from oversubscribing the box.
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    configure_ocr(backend, debug_artefacts, card_layout, ocr_cache)
+
+
+def parse_card_texts(texts: Dict[str, object], red_text: str, category: str) -> Dict[str, object]:
+    candidates = [parse_stat_readings(lines) for lines in texts["stats"].values()]
+    # Readings outside the category profile are OCR slips (lost decimal points, merged digits); drop them before
+    # voting unless nothing else read the field.
+    for key in {key for candidate in candidates for key in candidate}:
+        in_range = {
+            index for index, candidate in enumerate(candidates)
+            if key in candidate and stat_in_profile(category, key, candidate[key][0])
+        }
+        if in_range:
+            for index, candidate in enumerate(candidates):
+                if key in candidate and index not in in_range:
+                    del candidate[key]
+    fused_stats, field_confidence = fuse_stat_readings(candidates)
+    parsed_stats = sanitise_stats(postprocess_stats(fused_stats))
+    return {
+        "stats": {key: to_schema_number(value) for key, value in parsed_stats.items()},
+        "field_confidence": {key: field_confidence[key] for key in parsed_stats if key in field_confidence},
+        "abilities": extract_abilities(split_lines(texts["bullets"]), red_text, category),
+    }
 
-    scanned = 0
-    with_lootlemon = 0
-    changed = 0
-    failures: List[Dict[str, str]] = []
 
-    max_written = 0
-    abilities_written = 0
+@dataclass
+class FetchedCard:
+    job: CardJob
+    card_url: Optional[str] = None
+    data: Optional[bytes] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
 
+
+def fetch_card(job: CardJob) -> FetchedCard:
+    started = time.perf_counter()
+    fetched = FetchedCard(job=job, card_url=job.card_url)
+    try:
+        if job.offline and not job.card_url:
+            raise LookupError("no cached card URL (run once online first)")
+        fetched.card_url = job.card_url or parse_item_card_url(job.lootlemon_url)
+        if fetched.card_url:
+            fetched.data = load_card_bytes(fetched.card_url, job.category, job.slug, job.offline)
+    except Exception as error:
+        fetched.error = str(error)
+    fetched.seconds = time.perf_counter() - started
+    return fetched
+
+
+def empty_result(job: CardJob) -> Dict[str, object]:
+    return {
+        "index": job.index,
+        "path": job.path,
+        "slug": job.slug,
+        "card": False,
+        "card_url": job.card_url,
+        "layout": None,
+        "cache": None,
+        "stat_confidence": None,
+        "stat_fallback": None,
+        "reocr": {},
+        "field_confidence": {},
+        "stats": {},
+        "abilities": [],
+        "error": None,
+        "seconds": 0.0,
+        "rule_stats": {},
+    }
+
+
+def process_card(fetched: FetchedCard) -> Dict[str, object]:
+    started = time.perf_counter()
+    reset_ability_rule_stats()
+    job = fetched.job
+    result = empty_result(job)
+    result["card_url"] = fetched.card_url
+    result["error"] = fetched.error
+
+    if fetched.data is not None and not fetched.error:
+        try:
+            texts = ocr_image(fetched.data, job.slug, job.category)
+            result["card"] = True
+            result["layout"] = texts["layout"]
+            result["cache"] = texts["cache"]
+            result["stat_confidence"] = texts["stat_confidence"]
+            result["stat_fallback"] = texts["stat_fallback"]
+            result["reocr"] = texts["reocr"]
+            result.update(parse_card_texts(texts, job.red_text, job.category))
+        except Exception as error:
+            result["error"] = str(error)
+
+    result["rule_stats"] = ability_rule_stats()
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+class StageMeter:
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self.lock:
+            self.items += 1
+            self.busy += seconds
+
+    def report(self, wall: float) -> Dict[str, object]:
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "busy_seconds": round(self.busy, 2),
+            # Share of the stage's worker-seconds spent working; low occupancy means the stage was starved.
+            "occupancy": round(self.busy / (wall * self.workers), 3) if wall else None,
+        }
+
+
+class QueueMeter:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.samples = 0
+        self.total = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def sample(self, depth: int) -> None:
+        with self.lock:
+            self.samples += 1
+            self.total += depth
+            self.peak = max(self.peak, depth)
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "capacity": self.capacity,
+            "peak": self.peak,
+            "mean": round(self.total / self.samples, 2) if self.samples else 0,
+        }
+
+
+class CardPipeline:
+    """Fetch threads -> bounded queue -> OCR processes -> single in-order writer (the caller iterating run())."""
+
+    def __init__(self, jobs: List[CardJob], workers: int, fetch_workers: int, queue_size: int, ocr_settings: Tuple) -> None:
+        self.jobs = jobs
+        self.workers = workers
+        self.fetch_workers = max(1, min(fetch_workers, len(jobs) or 1))
+        self.ocr_settings = ocr_settings
+        self.fetched: "Queue[Optional[FetchedCard]]" = Queue(maxsize=queue_size)
+        self.results: "Queue[Dict[str, object]]" = Queue()
+        # Caps OCR work submitted but not yet picked up by the writer, so finished results cannot pile up unbounded.
+        self.in_flight = threading.BoundedSemaphore(max(1, workers * 2))
+        self.meters = {
+            "fetch": StageMeter(self.fetch_workers),
+            "ocr": StageMeter(workers),
+            "write": StageMeter(1),
+        }
+        self.fetched_meter = QueueMeter(queue_size)
+        self.reorder_peak = 0
+
+    def _fetcher(self, pending: "Queue[Optional[CardJob]]") -> None:
+        while True:
+            job = pending.get()
+            if job is None:
+                self.fetched.put(None)
+                return
+            fetched = fetch_card(job)
+            self.meters["fetch"].add(fetched.seconds)
+            # Blocks while OCR is behind: downloads never run more than queue_size cards ahead.
+            self.fetched.put(fetched)
+            self.fetched_meter.sample(self.fetched.qsize())
+
+    def _collect(self, fetched: FetchedCard) -> Callable[[Future], None]:
+        def done(future: Future) -> None:
+            try:
+                result = future.result()
+            except Exception as error:
+                result = empty_result(fetched.job)
+                result["error"] = f"ocr worker failed: {error}"
+            self.results.put(result)
+
+        return done
+
+    def _dispatcher(self, executor: Optional[ProcessPoolExecutor]) -> None:
+        finished_fetchers = 0
+        while finished_fetchers < self.fetch_workers:
+            fetched = self.fetched.get()
+            self.fetched_meter.sample(self.fetched.qsize())
+            if fetched is None:
+                finished_fetchers += 1
+                continue
+            self.in_flight.acquire()
+            if executor is None:
+                self.results.put(process_card(fetched))
+                continue
+            try:
+                executor.submit(process_card, fetched).add_done_callback(self._collect(fetched))
+            except Exception as error:
+                result = empty_result(fetched.job)
+                result["error"] = f"ocr worker failed: {error}"
+                self.results.put(result)
+
+    def run(self) -> Iterator[Dict[str, object]]:
+        pending: "Queue[Optional[CardJob]]" = Queue()
+        for job in self.jobs:
+            pending.put(job)
+        for _ in range(self.fetch_workers):
+            pending.put(None)
+
+        executor: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=self.ocr_settings)
+
+        threads = [threading.Thread(target=self._fetcher, args=(pending,), daemon=True) for _ in range(self.fetch_workers)]
+        threads.append(threading.Thread(target=self._dispatcher, args=(executor,), daemon=True))
+        for thread in threads:
+            thread.start()
+
+        buffered: Dict[int, Dict[str, object]] = {}
+        next_index = 0
+        try:
+            while next_index < len(self.jobs):
+                result = self.results.get()
+                self.in_flight.release()
+                self.meters["ocr"].add(float(result["seconds"]))
+                buffered[int(result["index"])] = result
+                self.reorder_peak = max(self.reorder_peak, len(buffered))
+                # Results arrive in completion order; hand them out in job order so writes and reports are stable.
+                while next_index in buffered:
+                    write_started = time.perf_counter()
+                    yield buffered.pop(next_index)
+                    self.meters["write"].add(time.perf_counter() - write_started)
+                    next_index += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def report(self, wall: float) -> Dict[str, object]:
+        return {
+            **{name: meter.report(wall) for name, meter in self.meters.items()},
+            "queues": {
+                "fetched": self.fetched_meter.report(),
+                "reorder_peak": self.reorder_peak,
+            },
+        }
+
+
+def load_card_urls() -> Dict[str, str]:
+    if not CARD_URLS_PATH.exists():
+        return {}
+    return json.loads(CARD_URLS_PATH.read_text(encoding="utf-8"))
+
+
+def collect_jobs(offline: bool = False) -> Tuple[int, List[CardJob]]:
+    card_urls = load_card_urls() if offline else {}
+    scanned = 0
+    jobs: List[CardJob] = []
     for category in CATEGORIES:
         for path in sorted((DATA_ROOT / category).glob("*.json")):
             scanned += 1
@@ -548,65 +1669,151 @@ def main() -> None:
             lootlemon_url = ((item.get("resources") or {}).get("lootlemon") or "").strip()
             if not lootlemon_url:
                 continue
-            with_lootlemon += 1
+            jobs.append(CardJob(
+                index=len(jobs),
+                category=category,
+                path=str(path),
+                slug=item.get("slug") or path.stem,
+                red_text=((item.get("special") or {}).get("title") or "").strip(),
+                lootlemon_url=lootlemon_url,
+                card_url=card_urls.get(lootlemon_url),
+                offline=offline,
+            ))
+    return scanned, jobs
+
+
+def apply_card_result(result: Dict[str, object]) -> Tuple[bool, bool, bool]:
+    path = Path(str(result["path"]))
+    item = json.loads(path.read_text(encoding="utf-8"))
+    before = json.dumps(item, sort_keys=True)
+
+    schema_stats = result["stats"]
+    if schema_stats:
+        item["max"] = schema_stats
+    elif "max" in item:
+        del item["max"]
+
+    parsed_abilities = result["abilities"]
+    if parsed_abilities:
+        item["abilities"] = parsed_abilities
+    elif "abilities" in item:
+        del item["abilities"]
+
+    after = json.dumps(item, sort_keys=True)
+    changed = before != after
+    if changed:
+        path.write_text(f"{json.dumps(item, indent=2, ensure_ascii=True)}\n", encoding="utf-8")
+    return changed, bool(schema_stats), bool(parsed_abilities)
 
-            slug = item.get("slug") or path.stem
-            red_text = ((item.get("special") or {}).get("title") or "").strip()
-            try:
-                card_url = parse_item_card_url(lootlemon_url)
-                if not card_url:
-                    continue
-
-                ocr_variants, _ = ocr_image(card_url, slug)
-                lines_gray = [line.strip() for line in ocr_variants["gray"].splitlines() if line.strip()]
-                lines_bw160 = [line.strip() for line in ocr_variants["bw160"].splitlines() if line.strip()]
-                lines_bw180 = [line.strip() for line in ocr_variants["bw180"].splitlines() if line.strip()]
-
-                parsed_stats = sanitise_stats(postprocess_stats(merge_stat_candidates([
-                    parse_stats(lines_gray),
-                    parse_stats(lines_bw160),
-                    parse_stats(lines_bw180),
-                ])))
-                parsed_abilities = extract_abilities(lines_gray, red_text)
-
-                schema_stats: Dict[str, float] = {}
-                for key, value in parsed_stats.items():
-                    schema_stats[key] = to_schema_number(value)
-
-                before = json.dumps(item, sort_keys=True)
-
-                if schema_stats:
-                    item["max"] = schema_stats
-                    max_written += 1
-                elif "max" in item:
-                    del item["max"]
-
-                if parsed_abilities:
-                    item["abilities"] = parsed_abilities
-                    abilities_written += 1
-                elif "abilities" in item:
-                    del item["abilities"]
-
-                after = json.dumps(item, sort_keys=True)
-                if before != after:
-                    changed += 1
-                    path.write_text(f"{json.dumps(item, indent=2, ensure_ascii=True)}\n", encoding="utf-8")
 
-            except Exception as error:
+def main() -> None:
+    args = parse_args()
+    ensure_dirs()
+
+    scanned, jobs = collect_jobs(args.offline)
+    card_urls = load_card_urls()
+    workers = max(1, min(args.workers, len(jobs) or 1))
+
+    changed = 0
+    failures: List[Dict[str, str]] = []
+    max_written = 0
+    abilities_written = 0
+    full_card_ocr = 0
+    card_stat_ocr = 0
+    cache_hits = 0
+    stat_fallbacks: Dict[str, int] = {}
+    field_confidence_totals: Dict[str, List[float]] = {}
+    reocr_totals: Dict[str, Dict[str, int]] = {}
+    low_confidence_fields: List[Dict[str, object]] = []
+    rule_totals: Dict[str, List[float]] = {rule.name: [0, 0.0] for rule in ABILITY_RULES}
+
+    ocr_settings = (args.ocr_backend, args.debug_artefacts, not args.no_layout, not args.no_ocr_cache)
+    configure_ocr(*ocr_settings)
+
+    pipeline = CardPipeline(
+        jobs,
+        workers=workers,
+        fetch_workers=args.fetch_workers,
+        queue_size=args.queue_size or workers * 2,
+        ocr_settings=ocr_settings,
+    )
+
+    started = time.perf_counter()
+    try:
+        for result in pipeline.run():
+            for name, (hits, seconds) in result["rule_stats"].items():
+                rule_totals[name][0] += hits
+                rule_totals[name][1] += seconds
+
+            if result["error"]:
                 failures.append({
-                    "file": str(path),
-                    "slug": str(slug),
-                    "error": str(error),
+                    "file": str(result["path"]),
+                    "slug": str(result["slug"]),
+                    "error": str(result["error"]),
                 })
+                continue
+            if result["card_url"]:
+                card_urls[jobs[int(result["index"])].lootlemon_url] = str(result["card_url"])
+            if not result["card"]:
+                continue
+            full_card_ocr += int(result["layout"] == "full")
+            card_stat_ocr += int(result["layout"] == "regions+card")
+            cache_hits += int(result["cache"] == "hit")
+            if result["stat_fallback"]:
+                reason = str(result["stat_fallback"]).split(":", 1)[0]
+                stat_fallbacks[reason] = stat_fallbacks.get(reason, 0) + 1
+            for field, outcome in result["reocr"].items():
+                totals = reocr_totals.setdefault(field, {"missing": 0, "out-of-range": 0, "recovered": 0})
+                totals[outcome["reason"]] += 1
+                totals["recovered"] += int(outcome["recovered"])
+            for field, confidence in result["field_confidence"].items():
+                totals = field_confidence_totals.setdefault(field, [0, 0.0])
+                totals[0] += 1
+                totals[1] += confidence
+                if confidence < LOW_FIELD_CONFIDENCE:
+                    low_confidence_fields.append({
+                        "slug": str(result["slug"]),
+                        "field": field,
+                        "value": result["stats"].get(field),
+                        "confidence": confidence,
+                    })
+
+            try:
+                item_changed, wrote_max, wrote_abilities = apply_card_result(result)
+            except Exception as error:
+                failures.append({"file": str(result["path"]), "slug": str(result["slug"]), "error": str(error)})
+                continue
+            changed += int(item_changed)
+            max_written += int(wrote_max)
+            abilities_written += int(wrote_abilities)
+    finally:
+        CARD_URLS_PATH.write_text(f"{json.dumps(card_urls, indent=2, sort_keys=True)}\n", encoding="utf-8")
 
     report = {
         "scanned": scanned,
-        "with_lootlemon": with_lootlemon,
+        "with_lootlemon": len(jobs),
         "changed": changed,
         "max_written": max_written,
         "abilities_written": abilities_written,
         "failed": len(failures),
         "failures": failures[:100],
+        "workers": workers,
+        "ocr_backend": resolve_ocr_backend(args.ocr_backend),
+        "card_layout": not args.no_layout,
+        "full_card_ocr": full_card_ocr,
+        "card_stat_ocr": card_stat_ocr,
+        "offline": args.offline,
+        "ocr_cache_hits": cache_hits,
+        "stat_variant_fallbacks": stat_fallbacks,
+        "targeted_reocr": dict(sorted(reocr_totals.items())),
+        "field_confidence": {
+            field: {"fields": count, "mean": round(total / count, 1)}
+            for field, (count, total) in sorted(field_confidence_totals.items())
+        },
+        "low_confidence_fields": sorted(low_confidence_fields, key=lambda entry: entry["confidence"])[:100],
+        "seconds": round(time.perf_counter() - started, 2),
+        "pipeline": pipeline.report(time.perf_counter() - started),
+        "ability_rules": ability_rule_report(rule_totals),
     }
     REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
     print(json.dumps(report, indent=2))
@@ -7,8 +7,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from PIL import Image
-import colorsys
+from catalogue_images import classify_name_colors
+from image_manifest import ImageManifest
 
 ROOT = Path.cwd()
 WEAPONS_DIR = ROOT / "data/games/borderlands2/weapons"
@@ -125,57 +125,6 @@ def rarity_tier_from_wiki_label(label: str) -> Optional[int]:
     return None
 
 
-def classify_name_color(image_path: Path) -> Tuple[Optional[str], float]:
-    if not image_path.exists():
-        return None, 0.0
-
-    image = Image.open(image_path).convert("RGB")
-    width, height = image.size
-
-    # Name text area on BL-style item cards.
-    x0, y0 = int(width * 0.056), int(height * 0.073)
-    x1, y1 = int(width * 0.317), int(height * 0.132)
-
-    roi = image.crop((x0, y0, x1, y1))
-    scored: List[Tuple[float, float]] = []
-
-    for red, green, blue in roi.getdata():
-        hue, saturation, value = colorsys.rgb_to_hsv(red / 255, green / 255, blue / 255)
-        if saturation > 0.18 and value > 0.25:
-            scored.append((saturation * value, hue))
-
-    if len(scored) < 40:
-        return None, 0.0
-
-    scored.sort(key=lambda entry: entry[0], reverse=True)
-    top = scored[:120]
-
-    buckets = {
-        "purple": 0,
-        "blue": 0,
-        "green": 0,
-        "orange": 0,
-    }
-
-    for _, hue in top:
-        if 0.72 <= hue <= 0.92:
-            buckets["purple"] += 1
-        elif 0.52 <= hue < 0.72:
-            buckets["blue"] += 1
-        elif 0.23 <= hue < 0.52:
-            buckets["green"] += 1
-        elif hue < 0.17 or hue > 0.95:
-            buckets["orange"] += 1
-
-    dominant = max(buckets, key=buckets.get)
-    confidence = buckets[dominant] / len(top)
-
-    if confidence < 0.70:
-        return None, confidence
-
-    return dominant, confidence
-
-
 def tier_from_color_bucket(bucket: Optional[str]) -> Optional[int]:
     if bucket == "green":
         return 2
@@ -193,6 +142,18 @@ def cumulative_rarities(max_tier: int) -> List[str]:
 def main() -> None:
     files = sorted(path for path in WEAPONS_DIR.glob("*.json"))
     cache: Dict[str, Tuple[str, str]] = {}
+    # Cards unchanged since the last image manifest build reuse its name colour; the rest are classified up front
+    # in one threaded numpy pass, so the loop below only looks results up.
+    manifest = ImageManifest.load()
+    name_colors: Dict[Path, Tuple[Optional[str], float]] = {}
+    unclassified: List[Path] = []
+    for card_path in sorted((WEAPONS_DIR / "img").glob("*.png")):
+        entry = manifest.current(card_path)
+        if entry is not None and "name_color" in entry:
+            name_colors[card_path] = (entry["name_color"][0], entry["name_color"][1])
+        else:
+            unclassified.append(card_path)
+    name_colors.update(classify_name_colors(unclassified))
     changes: List[Change] = []
 
     scanned = 0
@@ -252,7 +213,7 @@ def main() -> None:
             continue
 
         image_path = WEAPONS_DIR / "img" / f"{item['slug']}.png"
-        color_bucket, confidence = classify_name_color(image_path)
+        color_bucket, confidence = name_colors.get(image_path, (None, 0.0))
         image_tier = tier_from_color_bucket(color_bucket)
 
         current_max = max((BASE_TIER[rarity] for rarity in current_rarities), default=1)
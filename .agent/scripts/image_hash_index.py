@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+
+from PIL import Image
+
+from catalogue_images import DATA_ROOT, PHASH_SIZE, PUBLIC_ROOT, comparable, hamming, phash, sha256_file
+from image_manifest import ImageManifest
+
+
+IMAGE_ROOTS = [DATA_ROOT, PUBLIC_ROOT / "img/games"]
+INDEX_PATH = Path(".agent/index/image-phash-index.json")
+REPORT_PATH = Path(".agent/reports/image-hash-duplicates-report.json")
+
+HASH_BITS = PHASH_SIZE * PHASH_SIZE
+# Multi-index hashing: the 64-bit pHash is cut into CHUNKS substrings with one lookup table each. Two hashes within
+# distance k must agree to within k // CHUNKS bits on at least one substring (pigeonhole), so a query only probes
+# those neighbourhoods instead of scanning every image.
+CHUNKS = 4
+CHUNK_BITS = HASH_BITS // CHUNKS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+# Rescaled, padded or re-encoded copies land at 0-1 bits; different guns from one manufacturer share a silhouette
+# and start appearing from about 2 bits, so wider queries need a second look (verify-item-images.py, SSIM).
+DEFAULT_DISTANCE = 1
+
+
+def image_paths() -> list[Path]:
+    paths: list[Path] = []
+    for root in IMAGE_ROOTS:
+        paths.extend(sorted(root.glob("**/*.png")))
+    return paths
+
+
+def image_phash(path: Path, manifest: ImageManifest | None = None) -> int:
+    # The manifest stores the same content pHash; only files it has not described since their last change are decoded.
+    entry = manifest.current(path) if manifest is not None else None
+    if entry is not None:
+        return int(entry["phash"], 16)
+    with Image.open(path) as im:
+        return phash(comparable(im))
+
+
+def chunks(value: int) -> list[int]:
+    return [(value >> (CHUNK_BITS * index)) & CHUNK_MASK for index in range(CHUNKS)]
+
+
+@lru_cache(maxsize=None)
+def flip_masks(radius: int) -> tuple[int, ...]:
+    masks = [0]
+    for flips in range(1, radius + 1):
+        for bits in combinations(range(CHUNK_BITS), flips):
+            masks.append(sum(1 << bit for bit in bits))
+    return tuple(masks)
+
+
+def index_params() -> dict:
+    return {"hash": "phash", "bits": HASH_BITS, "chunks": CHUNKS, "crop": "content"}
+
+
+class ImageHashIndex:
+    def __init__(self, files: dict[str, dict] | None = None) -> None:
+        self.files: dict[str, dict] = {}
+        self.tables: list[dict[int, set[str]]] = [{} for _ in range(CHUNKS)]
+        for path, entry in (files or {}).items():
+            self.add(path, entry)
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> ImageHashIndex:
+        if not path.exists():
+            return cls()
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("params") != index_params():
+            return cls()
+        return cls(payload.get("files") or {})
+
+    def save(self, path: Path = INDEX_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"params": index_params(), "files": self.files}
+        path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+
+    def add(self, path: str, entry: dict) -> None:
+        self.remove(path)
+        self.files[path] = entry
+        for table, value in zip(self.tables, chunks(int(entry["phash"], 16))):
+            table.setdefault(value, set()).add(path)
+
+    def remove(self, path: str) -> None:
+        entry = self.files.pop(path, None)
+        if entry is None:
+            return
+        for table, value in zip(self.tables, chunks(int(entry["phash"], 16))):
+            owners = table.get(value)
+            if owners is not None:
+                owners.discard(path)
+                if not owners:
+                    del table[value]
+
+    def within(self, value: int, distance: int) -> list[tuple[str, int]]:
+        masks = flip_masks(distance // CHUNKS)
+        candidates: set[str] = set()
+        for table, part in zip(self.tables, chunks(value)):
+            for mask in masks:
+                candidates.update(table.get(part ^ mask, ()))
+
+        matches: list[tuple[str, int]] = []
+        for path in candidates:
+            bits = hamming(value, int(self.files[path]["phash"], 16))
+            if bits <= distance:
+                matches.append((path, bits))
+        return sorted(matches, key=lambda match: (match[1], match[0]))
+
+    def duplicate_pairs(self, distance: int) -> list[dict]:
+        pairs: list[dict] = []
+        for path, entry in sorted(self.files.items()):
+            for other, bits in self.within(int(entry["phash"], 16), distance):
+                if other > path:
+                    pairs.append({"left": path, "right": other, "bits": bits, "identical": entry["sha256"] == self.files[other]["sha256"]})
+        return sorted(pairs, key=lambda pair: (pair["bits"], pair["left"], pair["right"]))
+
+
+def build(full: bool = False) -> dict:
+    index = ImageHashIndex() if full else ImageHashIndex.load()
+    manifest = ImageManifest.load()
+    seen: set[str] = set()
+    reused = 0
+    rehashed = 0
+    failed: list[dict] = []
+
+    for path in image_paths():
+        key = str(path)
+        seen.add(key)
+        stat = path.stat()
+        cached = index.files.get(key)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            reused += 1
+            continue
+
+        described = manifest.current(path)
+        digest = described["sha256"] if described is not None else sha256_file(path)
+        if cached and cached["sha256"] == digest:
+            index.files[key] = {**cached, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            reused += 1
+            continue
+
+        try:
+            value = image_phash(path, manifest)
+        except Exception as error:
+            failed.append({"file": key, "error": str(error)})
+            index.remove(key)
+            continue
+        index.add(key, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest, "phash": f"{value:016x}"})
+        rehashed += 1
+
+    removed = sorted(set(index.files) - seen)
+    for key in removed:
+        index.remove(key)
+
+    index.save()
+    return {
+        "images": len(index.files),
+        "reused": reused,
+        "rehashed": rehashed,
+        "removed": len(removed),
+        "failed": failed,
+        "index": str(INDEX_PATH),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="Build or incrementally refresh the index")
+    build_parser.add_argument("--full", action="store_true", help="Ignore the stored index and re-hash every image")
+
+    query_parser = commands.add_parser("query", help="List indexed images within a Hamming distance of an image or hash")
+    query_parser.add_argument("target", help="Image path or 16-digit hex pHash")
+    query_parser.add_argument("-k", "--distance", type=int, default=DEFAULT_DISTANCE)
+
+    duplicates_parser = commands.add_parser("duplicates", help="Report every pair of indexed images within the distance")
+    duplicates_parser.add_argument("-k", "--distance", type=int, default=DEFAULT_DISTANCE)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "build":
+        print(json.dumps(build(full=args.full), indent=2))
+        return
+
+    if not INDEX_PATH.exists():
+        raise SystemExit(f"missing index {INDEX_PATH}; run `image_hash_index.py build` first")
+    index = ImageHashIndex.load()
+
+    if args.command == "query":
+        target = Path(args.target)
+        value = image_phash(target, ImageManifest.load()) if target.exists() else int(args.target, 16)
+        started = time.perf_counter()
+        matches = index.within(value, args.distance)
+        elapsed_us = (time.perf_counter() - started) * 1_000_000
+        print(json.dumps({
+            "phash": f"{value:016x}",
+            "distance": args.distance,
+            "micros": round(elapsed_us, 1),
+            "matches": [{"file": path, "bits": bits} for path, bits in matches],
+        }, indent=2))
+        if not matches:
+            sys.exit(1)
+        return
+
+    pairs = index.duplicate_pairs(args.distance)
+    report = {
+        "completedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "images": len(index.files),
+        "distance": args.distance,
+        "pairs": len(pairs),
+        "identical": sum(pair["identical"] for pair in pairs),
+        "matches": pairs,
+    }
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+    print(json.dumps({key: report[key] for key in ("images", "distance", "pairs", "identical")}, indent=2))
+    print(f"Report: {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
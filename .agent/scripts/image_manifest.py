@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+from catalogue_images import (
+    DATA_ROOT,
+    NAME_ROI,
+    PUBLIC_ROOT,
+    classify_name_color,
+    comparable,
+    content_bbox,
+    dominant_color,
+    phash,
+    sha256_file,
+)
+
+
+PUBLIC_IMAGE_ROOT = PUBLIC_ROOT / "img/games"
+MANIFEST_PATH = Path(".agent/index/image-manifest.json")
+
+LQIP_WIDTH = 16
+LQIP_QUALITY = 40
+
+
+def manifest_params() -> dict:
+    return {"phash": "content", "lqip_width": LQIP_WIDTH, "lqip_quality": LQIP_QUALITY, "name_roi": list(NAME_ROI)}
+
+
+def manifest_key(path: Path | str) -> str:
+    # Entries are keyed by repo-relative path; consumers that build absolute paths still find them.
+    path = Path(path)
+    if path.is_absolute() and path.is_relative_to(Path.cwd()):
+        path = path.relative_to(Path.cwd())
+    return str(path)
+
+
+def image_paths() -> list[Path]:
+    return sorted(DATA_ROOT.glob("*/*/img/**/*.png")) + sorted(PUBLIC_IMAGE_ROOT.glob("*/*/*.png"))
+
+
+def image_identity(path: Path) -> dict:
+    # public/img/games/<game>/<category>/<slug>.png, data/games/<game>/<category>/img[/<source>]/<slug>.png
+    if path.is_relative_to(PUBLIC_IMAGE_ROOT):
+        game, category = path.relative_to(PUBLIC_IMAGE_ROOT).parts[:2]
+        source = "public"
+    else:
+        parts = path.relative_to(DATA_ROOT).parts
+        game, category = parts[:2]
+        source = parts[3] if len(parts) > 4 else "data"
+    return {"game": game, "category": category, "slug": path.stem, "source": source}
+
+
+def lqip(im: Image.Image) -> str:
+    small = im.convert("RGBA" if "A" in im.getbands() or "transparency" in im.info else "RGB")
+    small.thumbnail((LQIP_WIDTH, LQIP_WIDTH * 4), Image.LANCZOS)
+    buffer = BytesIO()
+    small.save(buffer, format="WEBP", quality=LQIP_QUALITY)
+    return f"data:image/webp;base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+
+def describe(path: str) -> dict:
+    # One decode per image; every derived field comes from the same pixels.
+    with Image.open(path) as im:
+        im.load()
+        return {
+            "width": im.width,
+            "height": im.height,
+            "mode": im.mode,
+            "phash": f"{phash(comparable(im)):016x}",
+            "bbox": content_bbox(im),
+            "dominant": dominant_color(im),
+            "lqip": lqip(im),
+            "name_color": list(classify_name_color(im)),
+        }
+
+
+class ImageManifest:
+    def __init__(self, images: dict[str, dict] | None = None) -> None:
+        self.images = images or {}
+        self.by_digest: dict[str, list[str]] = {}
+        for path, entry in self.images.items():
+            self.by_digest.setdefault(entry["sha256"], []).append(path)
+
+    @classmethod
+    def load(cls, path: Path = MANIFEST_PATH) -> ImageManifest:
+        if not path.exists():
+            return cls()
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("params") != manifest_params():
+            return cls()
+        return cls(payload.get("images") or {})
+
+    def get(self, path: Path | str) -> dict | None:
+        return self.images.get(manifest_key(path))
+
+    def current(self, path: Path | str) -> dict | None:
+        # Only trust an entry while the file still has the size and mtime it was described at.
+        key = manifest_key(path)
+        entry = self.images.get(key)
+        if entry is None:
+            return None
+        try:
+            stat = Path(key).stat()
+        except OSError:
+            return None
+        if entry["mtime_ns"] != stat.st_mtime_ns or entry["bytes"] != stat.st_size:
+            return None
+        return entry
+
+    def with_digest(self, digest: str) -> list[str]:
+        return list(self.by_digest.get(digest, []))
+
+    def find(
+        self,
+        game: str | None = None,
+        category: str | None = None,
+        source: str | None = None,
+        slug: str | None = None,
+    ) -> list[dict]:
+        results: list[dict] = []
+        for path, entry in sorted(self.images.items()):
+            if game and entry["game"] != game:
+                continue
+            if category and entry["category"] != category:
+                continue
+            if source and entry["source"] != source:
+                continue
+            if slug and entry["slug"] != slug:
+                continue
+            results.append({"file": path, **entry})
+        return results
+
+
+def build(full: bool = False, workers: int = 1) -> dict:
+    previous = {} if full else ImageManifest.load().images
+    images: dict[str, dict] = {}
+    pending: dict[str, dict] = {}
+    reused = 0
+
+    for path in image_paths():
+        key = str(path)
+        stat = path.stat()
+        cached = previous.get(key)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["bytes"] == stat.st_size:
+            images[key] = cached
+            reused += 1
+            continue
+
+        digest = sha256_file(path)
+        header = {**image_identity(path), "mtime_ns": stat.st_mtime_ns, "bytes": stat.st_size, "sha256": digest}
+        if cached and cached["sha256"] == digest:
+            images[key] = {**cached, **header}
+            reused += 1
+            continue
+        pending[key] = header
+
+    keys = list(pending)
+    workers = max(1, min(workers, len(keys) or 1))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            described = list(executor.map(describe, keys, chunksize=8))
+    else:
+        described = [describe(key) for key in keys]
+    for key, fields in zip(keys, described):
+        images[key] = {**pending[key], **fields}
+
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST_PATH.write_text(
+        json.dumps({"params": manifest_params(), "images": dict(sorted(images.items()))}, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    return {
+        "images": len(images),
+        "reused": reused,
+        "described": len(keys),
+        "removed": len(set(previous) - set(images)),
+        "manifest": str(MANIFEST_PATH),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="Build or incrementally refresh the manifest")
+    build_parser.add_argument("--full", action="store_true", help="Ignore the stored manifest and decode every image")
+    build_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    get_parser = commands.add_parser("get", help="Print the manifest entry for one image path")
+    get_parser.add_argument("path")
+
+    find_parser = commands.add_parser("find", help="List manifest entries matching every given filter")
+    find_parser.add_argument("--game")
+    find_parser.add_argument("--category")
+    find_parser.add_argument("--source", help="public, data, or a source subdirectory such as lootlemon")
+    find_parser.add_argument("--slug")
+    find_parser.add_argument("--fields", nargs="+", help="Only print these fields (file is always included)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "build":
+        print(json.dumps(build(full=args.full, workers=args.workers), indent=2))
+        return
+
+    if not MANIFEST_PATH.exists():
+        raise SystemExit(f"missing manifest {MANIFEST_PATH}; run `image_manifest.py build` first")
+    manifest = ImageManifest.load()
+
+    if args.command == "get":
+        entry = manifest.get(args.path)
+        if entry is None:
+            raise SystemExit(f"{args.path} is not in the manifest")
+        print(json.dumps(entry, indent=2))
+        return
+
+    results = manifest.find(game=args.game, category=args.category, source=args.source, slug=args.slug)
+    if args.fields:
+        results = [{"file": entry["file"], **{field: entry.get(field) for field in args.fields}} for entry in results]
+    print(json.dumps(results, indent=2))
+    if not results:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import shutil
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import unquote, urljoin
+
+import numpy as np
+import requests
+from bs4 import BeautifulSoup
+from PIL import Image
+
+from catalogue_images import DATA_ROOT, flatten_alpha
+
+try:
+    # Registers AVIF decoding on Pillow builds without native AVIF support.
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+
+USER_AGENT = {"user-agent": "Mozilla/5.0 (compatible; BorderlensBot/1.0)"}
+WIKI_API_URL = "https://borderlands.fandom.com/api.php"
+
+WIKI_ORIGINALS_DIR = Path(".agent/wiki-originals")
+SOURCE_CACHE_DIR = Path(".agent/temp/image-sources")
+REPORT_PATH = Path(".agent/reports/image-source-selection-report.json")
+
+SOURCES = ["lootlemon", "wiki"]
+
+# Sharpness is measured at one common content width, so a larger image is not rewarded twice (resolution and detail).
+SHARPNESS_WIDTH = 512
+BORDER_SHARE = 0.04
+BACKGROUND_DELTA = 24
+# Above this share of the canvas the item is framed tightly enough; coverage only penalises tiny items on big canvases.
+TARGET_COVERAGE = 0.35
+# Content this many pixels across (geometric mean of bbox sides) already exceeds every size the site renders.
+TARGET_RESOLUTION = 1200
+
+# Effective resolution: content is downscaled by each ladder factor and scaled back, and the share of edge contrast
+# that round trip removes is measured. Native renders lose DETAIL_LOSS of it at about NATIVE_SCALE; an image
+# upscaled k times only reaches it near k * NATIVE_SCALE, because it never had detail finer than that.
+DETAIL_LADDER = (1.25, 1.5, 2.0, 3.0, 4.0)
+DETAIL_LOSS = 0.15
+NATIVE_SCALE = 1.2
+DETAIL_MAX_SIDE = 2048
+# Edges are the strongest EDGE_SHARE of gradients on a copy smoothed EDGE_SMOOTHING times, so noise is not detail.
+EDGE_SHARE = 0.1
+EDGE_SMOOTHING = 4
+
+SCORE_WEIGHTS = {"resolution": 0.35, "sharpness": 0.25, "uniformity": 0.25, "coverage": 0.15}
+CLOSE_MARGIN = 0.05
+
+
+def fetch_bytes(url: str, params: dict[str, str] | None = None) -> bytes:
+    response = requests.get(url, params=params, headers=USER_AGENT, timeout=40)
+    response.raise_for_status()
+    return response.content
+
+
+def lootlemon_image_url(page_url: str) -> str:
+    soup = BeautifulSoup(fetch_bytes(page_url), "html.parser")
+    image = soup.select_one("img#page-image")
+    src = ((image.get("src") or image.get("data-src")) if image else "") or ""
+    if not src:
+        raise RuntimeError(f"no page image on {page_url}")
+    return urljoin("https://www.lootlemon.com/", src)
+
+
+def parse_largest_srcset(srcset: str) -> str:
+    # Largest density wins; entries are "url 1x, url 2x", and a missing or malformed density counts as 1x.
+    best_url = ""
+    best_scale = -1.0
+    for part in srcset.split(","):
+        entry = part.strip()
+        if not entry:
+            continue
+        pieces = entry.split()
+        url = pieces[0]
+        scale = 1.0
+        if len(pieces) > 1 and pieces[1].endswith("x"):
+            try:
+                scale = float(pieces[1][:-1])
+            except ValueError:
+                scale = 1.0
+        if scale > best_scale:
+            best_scale = scale
+            best_url = url
+    if not best_url:
+        raise RuntimeError("no srcset URL found")
+    return best_url
+
+
+def wiki_image_url(page_url: str) -> str:
+    title = unquote(page_url.split("/wiki/")[-1]).replace("_", " ")
+    payload = json.loads(fetch_bytes(
+        WIKI_API_URL,
+        {"action": "parse", "page": title, "prop": "text", "format": "json", "formatversion": "2", "redirects": "1"},
+    ))
+    soup = BeautifulSoup(payload.get("parse", {}).get("text", ""), "html.parser")
+    image = soup.select_one('figure[data-source="image"] img')
+    if image is None:
+        raise RuntimeError(f"no infobox image on {page_url}")
+    srcset = image.get("srcset") or ""
+    if srcset:
+        return urljoin(page_url, parse_largest_srcset(srcset))
+    src = image.get("data-src") or image.get("src") or ""
+    if not src:
+        raise RuntimeError(f"no usable image URL on {page_url}")
+    return urljoin(page_url, src)
+
+
+def source_paths(json_path: Path, game: str, category: str, slug: str, source: str) -> list[Path]:
+    # Images other scripts already downloaded come first, so nothing is fetched twice.
+    cached = SOURCE_CACHE_DIR / game / category / f"{slug}-{source}.png"
+    if source == "lootlemon":
+        return [json_path.parent / "img" / "lootlemon" / f"{slug}.png", cached]
+    return [WIKI_ORIGINALS_DIR / f"{game}-{category}" / f"{slug}.png", cached]
+
+
+def load_source(
+    json_path: Path,
+    item: dict,
+    source: str,
+    fetch: bool,
+    failures: list[dict[str, str]],
+) -> Path | None:
+    game, category = json_path.parent.parent.name, json_path.parent.name
+    slug = item.get("slug") or json_path.stem
+    candidates = source_paths(json_path, game, category, slug, source)
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+
+    page_url = ((item.get("resources") or {}).get(source) or "").strip()
+    if not fetch or not page_url:
+        return None
+    try:
+        image_url = lootlemon_image_url(page_url) if source == "lootlemon" else wiki_image_url(page_url)
+        destination = candidates[-1]
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with Image.open(BytesIO(fetch_bytes(image_url))) as im:
+            im.convert("RGBA").save(destination, format="PNG")
+        return destination
+    except Exception as error:
+        failures.append({"item": f"{game}/{category}/{slug}", "source": source, "error": str(error)})
+        return None
+
+
+def gradient_magnitude(gray: np.ndarray) -> np.ndarray:
+    gx = np.zeros_like(gray)
+    gy = np.zeros_like(gray)
+    gx[:, 1:-1] = gray[:, 2:] - gray[:, :-2]
+    gy[1:-1] = gray[2:] - gray[:-2]
+    return np.hypot(gx, gy) / 2
+
+
+def structural_edges(image: Image.Image) -> np.ndarray:
+    width, height = image.size
+    small = (max(1, width // EDGE_SMOOTHING), max(1, height // EDGE_SMOOTHING))
+    smooth = image.resize(small, Image.BOX).resize((width, height), Image.BILINEAR)
+    gradient = gradient_magnitude(np.asarray(smooth, dtype=np.float64))
+    return gradient >= max(float(np.quantile(gradient, 1 - EDGE_SHARE)), 1.0)
+
+
+def edge_laplacian_variance(image: Image.Image) -> float:
+    # 4-neighbour Laplacian as array slices, sampled on structural edges only: flat areas carry no sharpness
+    # signal, just noise that would otherwise read as detail.
+    gray = np.asarray(image, dtype=np.float64)
+    edges = structural_edges(image)[1:-1, 1:-1]
+    if not edges.any():
+        return 0.0
+    centre = gray[1:-1, 1:-1]
+    laplacian = gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:] - 4 * centre
+    return float(laplacian[edges].var())
+
+
+def upscale_factor(image: Image.Image) -> float:
+    gray = np.asarray(image, dtype=np.float64)
+    edges = structural_edges(image)
+    if not edges.any():
+        return 1.0
+    contrast = max(float(gradient_magnitude(gray)[edges].mean()), 1e-9)
+
+    previous = (1.0, 0.0)
+    for factor in DETAIL_LADDER:
+        small = (max(1, round(image.width / factor)), max(1, round(image.height / factor)))
+        round_trip = image.resize(small, Image.LANCZOS).resize(image.size, Image.LANCZOS)
+        loss = float(np.abs(gray - np.asarray(round_trip, dtype=np.float64))[edges].mean()) / contrast
+        if loss >= DETAIL_LOSS:
+            crossing = previous[0] + (factor - previous[0]) * (DETAIL_LOSS - previous[1]) / (loss - previous[1])
+            return max(1.0, crossing / NATIVE_SCALE)
+        previous = (factor, loss)
+    return DETAIL_LADDER[-1] / NATIVE_SCALE
+
+
+def candidate_metrics(im: Image.Image) -> dict:
+    rgba = np.asarray(im.convert("RGBA"), dtype=np.int16)
+    height, width = rgba.shape[:2]
+    ring = max(1, round(min(width, height) * BORDER_SHARE))
+    border = np.concatenate((
+        rgba[:ring].reshape(-1, 4),
+        rgba[-ring:].reshape(-1, 4),
+        rgba[ring:-ring, :ring].reshape(-1, 4),
+        rgba[ring:-ring, -ring:].reshape(-1, 4),
+    ))
+
+    # Background is whatever the border mostly is (transparency, or its most common colour); uniformity is the
+    # share of the border that matches it, so a clean backdrop scores 1 and noise or a busy scene scores low.
+    clear = border[:, 3] == 0
+    if clear.mean() >= 0.5:
+        foreground = rgba[..., 3] != 0
+        uniformity = float(clear.mean())
+    else:
+        bins = (border[:, :3] >> 4).astype(np.int32)
+        codes = (bins[:, 0] << 8) | (bins[:, 1] << 4) | bins[:, 2]
+        background = border[codes == np.bincount(codes).argmax(), :3].mean(axis=0)
+        foreground = (np.abs(rgba[..., :3] - background).max(axis=2) > BACKGROUND_DELTA) & (rgba[..., 3] != 0)
+        uniformity = float((np.abs(border[:, :3] - background).max(axis=1) <= BACKGROUND_DELTA).mean())
+
+    columns = np.flatnonzero(foreground.any(axis=0))
+    rows = np.flatnonzero(foreground.any(axis=1))
+    if columns.size == 0:
+        return {
+            "width": width,
+            "height": height,
+            "content": None,
+            "effective": 0,
+            "upscale": None,
+            "coverage": 0.0,
+            "uniformity": round(uniformity, 4),
+            "sharpness": 0.0,
+        }
+    box = (int(columns[0]), int(rows[0]), int(columns[-1]) + 1, int(rows[-1]) + 1)
+    content = flatten_alpha(im).convert("L").crop(box)
+    scale = SHARPNESS_WIDTH / content.width
+    sample = content.resize((SHARPNESS_WIDTH, max(3, round(content.height * scale))), Image.LANCZOS)
+
+    # Very large content is measured at DETAIL_MAX_SIDE; the upscale factor then applies to that grid.
+    detail = content
+    if max(content.size) > DETAIL_MAX_SIDE:
+        detail = content.copy()
+        detail.thumbnail((DETAIL_MAX_SIDE, DETAIL_MAX_SIDE), Image.LANCZOS)
+    upscale = upscale_factor(detail)
+
+    return {
+        "width": width,
+        "height": height,
+        "content": [box[2] - box[0], box[3] - box[1]],
+        "effective": round(math.sqrt(detail.width * detail.height) / upscale),
+        "upscale": round(upscale, 2),
+        "coverage": round(float(foreground.mean()), 4),
+        "uniformity": round(uniformity, 4),
+        "sharpness": round(edge_laplacian_variance(sample), 2),
+    }
+
+
+def candidate_scores(metrics: dict[str, dict]) -> dict[str, dict[str, float]]:
+    sharpest = max((entry["sharpness"] for entry in metrics.values()), default=0.0) or 1.0
+    scores: dict[str, dict[str, float]] = {}
+    for source, entry in metrics.items():
+        parts = {
+            "resolution": min(entry["effective"] / TARGET_RESOLUTION, 1.0),
+            "sharpness": entry["sharpness"] / sharpest,
+            "uniformity": entry["uniformity"],
+            "coverage": min(entry["coverage"] / TARGET_COVERAGE, 1.0),
+        }
+        parts["total"] = sum(SCORE_WEIGHTS[name] * value for name, value in parts.items())
+        scores[source] = {name: round(value, 4) for name, value in parts.items()}
+    return scores
+
+
+def explain(chosen: str, metrics: dict[str, dict], scores: dict[str, dict[str, float]]) -> list[str]:
+    reasons: list[str] = []
+    for other in scores:
+        if other == chosen:
+            continue
+        mine, theirs = metrics[chosen], metrics[other]
+        for name in SCORE_WEIGHTS:
+            gap = scores[chosen][name] - scores[other][name]
+            if abs(gap) < 0.02:
+                continue
+            better = "better" if gap > 0 else "worse"
+            if name == "resolution":
+                detail = (
+                    f"effective {mine['effective']}px vs {theirs['effective']}px; content {mine['content']} at "
+                    f"{mine['upscale']}x vs {theirs['content']} at {theirs['upscale']}x upscale"
+                )
+            elif name == "sharpness":
+                detail = f"edge Laplacian variance {mine['sharpness']} vs {theirs['sharpness']} at {SHARPNESS_WIDTH}px"
+            elif name == "uniformity":
+                detail = f"{mine['uniformity']:.0%} vs {theirs['uniformity']:.0%} of the border is plain background"
+            else:
+                detail = f"coverage {mine['coverage']:.0%} vs {theirs['coverage']:.0%}"
+            reasons.append(f"{name} {better} than {other} ({detail}; weighted {SCORE_WEIGHTS[name] * gap:+.3f})")
+        margin = scores[chosen]["total"] - scores[other]["total"]
+        reasons.append(f"total {scores[chosen]['total']:.3f} vs {other} {scores[other]['total']:.3f} (margin {margin:.3f})")
+    return reasons or ["only candidate"]
+
+
+def choose_source(paths: dict[str, Path]) -> dict:
+    metrics: dict[str, dict] = {}
+    for source, path in paths.items():
+        with Image.open(path) as im:
+            metrics[source] = candidate_metrics(im)
+    usable = {source: entry for source, entry in metrics.items() if entry["content"]}
+    if not usable:
+        return {"chosen": None, "metrics": metrics, "scores": {}, "reasons": ["no candidate has any foreground"]}
+
+    scores = candidate_scores(usable)
+    ranked = sorted(scores, key=lambda source: scores[source]["total"], reverse=True)
+    chosen = ranked[0]
+    margin = scores[chosen]["total"] - scores[ranked[1]]["total"] if len(ranked) > 1 else None
+    return {
+        "chosen": chosen,
+        "file": str(paths[chosen]),
+        "margin": round(margin, 4) if margin is not None else None,
+        "close": margin is not None and margin < CLOSE_MARGIN,
+        "metrics": metrics,
+        "scores": scores,
+        "reasons": explain(chosen, usable, scores),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("slugs", nargs="*", help="Only score these slugs (default: every item in scope)")
+    parser.add_argument("--game", help="Limit to one game (default: every game under data/games)")
+    parser.add_argument("--category", help="Limit to one category (default: every category)")
+    parser.add_argument("--fetch-sources", action="store_true", help="Download missing Lootlemon/wiki images into the cache")
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Copy each clear pick to the item's img/<slug>.png, ready for the crop and optimise passes; close picks are left for review",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    pattern = f"{args.game or '*'}/{args.category or '*'}/*.json"
+    wanted = set(args.slugs)
+
+    selections: list[dict] = []
+    failures: list[dict[str, str]] = []
+    no_candidates: list[str] = []
+    applied = 0
+    held: list[str] = []
+
+    for json_path in sorted(DATA_ROOT.glob(pattern)):
+        item = json.loads(json_path.read_text(encoding="utf-8"))
+        slug = item.get("slug") or json_path.stem
+        if wanted and slug not in wanted:
+            continue
+        key = f"{json_path.parent.parent.name}/{json_path.parent.name}/{slug}"
+        paths: dict[str, Path] = {}
+        for source in SOURCES:
+            path = load_source(json_path, item, source, args.fetch_sources, failures)
+            if path is not None:
+                paths[source] = path
+        if not paths:
+            no_candidates.append(key)
+            continue
+
+        selection = {"item": key, **choose_source(paths)}
+        selections.append(selection)
+        if args.apply and selection["chosen"] and selection["close"]:
+            held.append(key)
+        elif args.apply and selection["chosen"]:
+            destination = json_path.parent / "img" / f"{slug}.png"
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(selection["file"], destination)
+            applied += 1
+
+    chosen_counts: dict[str, int] = {}
+    for selection in selections:
+        chosen_counts[str(selection["chosen"])] = chosen_counts.get(str(selection["chosen"]), 0) + 1
+    report = {
+        "completedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "game": args.game,
+        "category": args.category,
+        "weights": SCORE_WEIGHTS,
+        "scored": len(selections),
+        "chosen": chosen_counts,
+        "close": sum(1 for selection in selections if selection.get("close")),
+        "applied": applied,
+        "held_for_review": held,
+        "no_candidates": no_candidates,
+        "source_failures": failures,
+        "selections": selections,
+    }
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+    summary = {key: report[key] for key in ("scored", "chosen", "close", "applied")}
+    summary["held_for_review"] = len(held)
+    print(json.dumps(summary, indent=2))
+    print(f"Report: {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+
+DATA_ROOT = Path("data/games")
+INDEX_PATH = Path(".agent/index/item-search-index.json")
+# Per-file tokenised terms for incremental rebuilds; only build reads it, so load() and queries never parse it.
+BUILD_STATE_PATH = Path(".agent/index/item-search-build.json")
+
+K1 = 1.2
+B = 0.75
+
+# Field weights are applied to term frequency before BM25 saturation, so a name hit outranks a notes-style hit.
+FIELD_WEIGHTS = {
+    "name": 4,
+    "aliases": 3,
+    "special.title": 2,
+    "skills": 2,
+    "type": 1,
+    "manufacturers": 1,
+    "special.description": 1,
+    "abilities": 1,
+    "parts": 1,
+    "sources": 1,
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower().replace("'", ""))
+
+
+def field_texts(item: dict) -> dict[str, list[str]]:
+    special = item.get("special") or {}
+    parts: list[str] = []
+    for group, entries in (item.get("parts") or {}).items():
+        parts.append(group)
+        for entry in entries or []:
+            parts.append(entry.get("name") or "")
+            parts.extend(entry.get("modifiers") or [])
+    sources: list[str] = []
+    for source in item.get("sources") or []:
+        sources.append(source.get("name") or "")
+        sources.extend(source.get("tags") or [])
+    return {
+        "name": [item.get("name") or ""],
+        "aliases": list(item.get("aliases") or []),
+        "special.title": [special.get("title") or ""],
+        "special.description": [special.get("description") or ""],
+        "skills": list(item.get("skills") or []),
+        "type": [item.get("type") or ""],
+        "manufacturers": list(item.get("manufacturers") or []),
+        "abilities": list(item.get("abilities") or []),
+        "parts": parts,
+        "sources": sources,
+    }
+
+
+def weighted_terms(item: dict) -> tuple[dict[str, int], int]:
+    counts: Counter[str] = Counter()
+    length = 0
+    for field, values in field_texts(item).items():
+        weight = FIELD_WEIGHTS[field]
+        for value in values:
+            tokens = tokenize(value)
+            length += len(tokens)
+            for token in tokens:
+                counts[token] += weight
+    return dict(counts), length
+
+
+def document_meta(path: Path, item: dict) -> dict:
+    return {
+        "id": f"{path.parent.parent.name}/{path.parent.name}/{item.get('slug') or path.stem}",
+        "name": item.get("name") or "",
+        "game": path.parent.parent.name,
+        "category": path.parent.name,
+        "slug": item.get("slug") or path.stem,
+        "file": str(path),
+    }
+
+
+def build(full: bool = False) -> dict:
+    previous: dict[str, dict] = {}
+    if not full and BUILD_STATE_PATH.exists():
+        payload = json.loads(BUILD_STATE_PATH.read_text(encoding="utf-8"))
+        if payload.get("params") == index_params():
+            previous = payload.get("files") or {}
+
+    files: dict[str, dict] = {}
+    reused = 0
+    reindexed = 0
+
+    for path in sorted(DATA_ROOT.glob("*/*/*.json")):
+        stat = path.stat()
+        key = str(path)
+        cached = previous.get(key)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            files[key] = cached
+            reused += 1
+            continue
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached and cached["digest"] == digest:
+            files[key] = {**cached, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            reused += 1
+            continue
+
+        item = json.loads(raw.decode("utf-8"))
+        terms, length = weighted_terms(item)
+        files[key] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "digest": digest,
+            "meta": document_meta(path, item),
+            "terms": terms,
+            "length": length,
+        }
+        reindexed += 1
+
+    docs = [entry["meta"] for entry in files.values()]
+    entries = list(files.values())
+    avg_length = sum(entry["length"] for entry in entries) / max(len(entries), 1)
+
+    document_frequency: Counter[str] = Counter()
+    for entry in entries:
+        document_frequency.update(entry["terms"].keys())
+
+    # Postings carry the final per-document BM25 weight, so a query is only lookups and additions.
+    postings: dict[str, list[list[float]]] = {}
+    total = len(entries)
+    for doc_id, entry in enumerate(entries):
+        norm = K1 * (1 - B + B * entry["length"] / avg_length) if avg_length else K1
+        for term, tf in entry["terms"].items():
+            df = document_frequency[term]
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            weight = idf * tf * (K1 + 1) / (tf + norm)
+            postings.setdefault(term, []).append([doc_id, round(weight, 4)])
+
+    INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    INDEX_PATH.write_text(
+        json.dumps({"params": index_params(), "docs": docs, "postings": postings}, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    BUILD_STATE_PATH.write_text(json.dumps({"params": index_params(), "files": files}, separators=(",", ":")), encoding="utf-8")
+    return {
+        "documents": total,
+        "terms": len(postings),
+        "reused": reused,
+        "reindexed": reindexed,
+        "removed": len(set(previous) - set(files)),
+        "index": str(INDEX_PATH),
+    }
+
+
+def index_params() -> dict:
+    return {"k1": K1, "b": B, "fields": FIELD_WEIGHTS}
+
+
+class ItemSearchIndex:
+    def __init__(self, docs: list[dict], postings: dict[str, list[list[float]]]) -> None:
+        self.docs = docs
+        self.postings = postings
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> ItemSearchIndex:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return cls(payload["docs"], payload["postings"])
+
+    def search(self, query: str, limit: int = 10, game: str | None = None, category: str | None = None) -> list[dict]:
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            for doc_id, weight in self.postings.get(term, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+
+        if game or category:
+            ranked = sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda entry: entry[1])
+        results: list[dict] = []
+        for doc_id, score in ranked:
+            doc = self.docs[int(doc_id)]
+            if game and doc["game"] != game:
+                continue
+            if category and doc["category"] != category:
+                continue
+            results.append({**doc, "score": round(score, 4)})
+            if len(results) >= limit:
+                break
+        return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="Build or incrementally refresh the index")
+    build_parser.add_argument("--full", action="store_true", help="Ignore the stored index and re-tokenise everything")
+
+    query_parser = commands.add_parser("query", help="Run a query against the stored index")
+    query_parser.add_argument("text")
+    query_parser.add_argument("--limit", type=int, default=10)
+    query_parser.add_argument("--game")
+    query_parser.add_argument("--category")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "build":
+        print(json.dumps(build(full=args.full), indent=2))
+        return
+
+    if not INDEX_PATH.exists():
+        raise SystemExit(f"missing index {INDEX_PATH}; run `item_search_index.py build` first")
+    index = ItemSearchIndex.load()
+    started = time.perf_counter()
+    results = index.search(args.text, limit=args.limit, game=args.game, category=args.category)
+    elapsed_us = (time.perf_counter() - started) * 1_000_000
+    print(json.dumps({"query": args.text, "micros": round(elapsed_us, 1), "results": results}, indent=2))
+    if not results:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
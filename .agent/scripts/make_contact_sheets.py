@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import math
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from catalogue_images import PUBLIC_ROOT
+from image_manifest import ImageManifest
+
+
+IMAGE_ROOT = PUBLIC_ROOT / "img/games"
+OUT_ROOT = Path(".agent/temp/contact_sheets")
+THUMB_DIR = Path(".agent/temp/thumbnail-cache")
+
+CELL_W = 360
+CELL_H = 140
+LABEL_H = 28
+TITLE_H = 42
+COLS = 4
+PER_SHEET = 40
+BG = (247, 244, 238)
+FG = (20, 20, 20)
+ACCENT = (210, 205, 196)
+TITLE_BG = (230, 225, 216)
+
+GAME_TITLES = {"borderlands": "Borderlands", "borderlands2": "Borderlands 2"}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IDAT_SIZE = 1 << 16
+
+
+def load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    for candidate in (
+        "/System/Library/Fonts/Supplemental/Menlo.ttc",
+        "/System/Library/Fonts/Supplemental/Courier New.ttf",
+    ):
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def thumbnail_path(digest: str, size: tuple[int, int]) -> Path:
+    return THUMB_DIR / digest[:2] / f"{digest}-{size[0]}x{size[1]}.png"
+
+
+def build_thumbnail(task: tuple[Path, Path, tuple[int, int]]) -> Path:
+    path, out_path, size = task
+    with Image.open(path) as im:
+        # draft() lets JPEG/WebP sources decode at a fraction of full size; PNGs ignore it and
+        # thumbnail() box-reduces first (reducing_gap) so LANCZOS only runs on a small intermediate.
+        im.draft("RGB", size)
+        im = im.convert("RGBA") if im.mode != "RGBA" else im
+        im.thumbnail(size, Image.LANCZOS, reducing_gap=2.0)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = out_path.with_suffix(f".{os.getpid()}.tmp")
+        im.save(tmp_path, format="PNG")
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def thumbnails(paths: list[Path], size: tuple[int, int], workers: int) -> dict[Path, Path]:
+    # Keyed by source content and cell size, so an edited image (or a new layout) misses and nothing else does.
+    # Unchanged catalogue images take their digest from the image manifest instead of being read and hashed.
+    manifest = ImageManifest.load()
+    cached: dict[Path, Path] = {}
+    missing: list[tuple[Path, Path, tuple[int, int]]] = []
+    for path in paths:
+        entry = manifest.current(path)
+        digest = entry["sha256"] if entry else hashlib.sha256(path.read_bytes()).hexdigest()
+        out_path = thumbnail_path(digest, size)
+        cached[path] = out_path
+        if not out_path.exists():
+            missing.append((path, out_path, size))
+
+    workers = max(1, min(workers, len(missing)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(build_thumbnail, missing, chunksize=4))
+    else:
+        for task in missing:
+            build_thumbnail(task)
+    return cached
+
+
+class PngStreamWriter:
+    """Writes an RGB PNG band by band; only the current band and the zlib window are ever in memory."""
+
+    def __init__(self, handle: BinaryIO, width: int, height: int) -> None:
+        self.handle = handle
+        self.width = width
+        self.height = height
+        self.rows = 0
+        self.previous = np.zeros(width * 3, dtype=np.uint8)
+        self.compressor = zlib.compressobj(6)
+        self.pending = bytearray()
+        handle.write(PNG_SIGNATURE)
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, kind: bytes, data: bytes) -> None:
+        self.handle.write(struct.pack(">I", len(data)))
+        self.handle.write(kind)
+        self.handle.write(data)
+        self.handle.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+    def _emit(self, data: bytes) -> None:
+        self.pending += data
+        while len(self.pending) >= IDAT_SIZE:
+            self._chunk(b"IDAT", bytes(self.pending[:IDAT_SIZE]))
+            del self.pending[:IDAT_SIZE]
+
+    def write_band(self, band: Image.Image) -> None:
+        rows = np.asarray(band.convert("RGB"), dtype=np.uint8).reshape(band.height, self.width * 3)
+        above = np.vstack((self.previous, rows[:-1]))
+        # Per-row filter choice (None, Sub, Up) by the usual minimum-sum-of-absolute-differences heuristic.
+        candidates = np.stack((
+            rows,
+            rows - np.pad(rows, ((0, 0), (3, 0)))[:, :-3],
+            rows - above,
+        ))
+        cost = np.abs(candidates.view(np.int8).astype(np.int16)).sum(axis=2)
+        choice = cost.argmin(axis=0)
+        filtered = np.empty((band.height, self.width * 3 + 1), dtype=np.uint8)
+        filtered[:, 0] = choice
+        filtered[:, 1:] = candidates[choice, np.arange(band.height)]
+        self._emit(self.compressor.compress(filtered.tobytes()))
+        self.previous = rows[-1].copy()
+        self.rows += band.height
+
+    def close(self) -> None:
+        if self.rows != self.height:
+            raise RuntimeError(f"wrote {self.rows} rows, header promised {self.height}")
+        self._emit(self.compressor.flush())
+        if self.pending:
+            self._chunk(b"IDAT", bytes(self.pending))
+        self._chunk(b"IEND", b"")
+
+
+def render_band(
+    paths: list[Path],
+    thumbs: dict[Path, Path],
+    width: int,
+    label_font: ImageFont.ImageFont,
+    below_row: bool,
+) -> Image.Image:
+    band = Image.new("RGBA", (width, CELL_H + LABEL_H), BG + (255,))
+    draw = ImageDraw.Draw(band)
+    if below_row:
+        # The row above is always full, and its cells' bottom edges sit on this band's first line.
+        draw.line((0, 0, width, 0), fill=ACCENT, width=1)
+    for col, path in enumerate(paths):
+        x0 = col * CELL_W
+        draw.rectangle((x0, 0, x0 + CELL_W, CELL_H + LABEL_H), outline=ACCENT, width=1)
+
+        with Image.open(thumbs[path]) as im:
+            im = im.convert("RGBA")
+            band.alpha_composite(im, (x0 + (CELL_W - im.width) // 2, (CELL_H - im.height) // 2))
+
+        label = path.stem
+        bbox = draw.textbbox((0, 0), label, font=label_font)
+        draw.text((x0 + max(8, (CELL_W - (bbox[2] - bbox[0])) // 2), CELL_H + 5), label, fill=FG, font=label_font)
+    return band
+
+
+def make_sheet(paths: list[Path], out_path: Path, title: str, thumbs: dict[Path, Path]) -> None:
+    rows = math.ceil(len(paths) / COLS)
+    width = COLS * CELL_W
+    title_font = load_font(22)
+    label_font = load_font(16)
+
+    header = Image.new("RGB", (width, TITLE_H), TITLE_BG)
+    ImageDraw.Draw(header).text((16, 10), title, fill=FG, font=title_font)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("wb") as handle:
+        writer = PngStreamWriter(handle, width, TITLE_H + rows * (CELL_H + LABEL_H))
+        writer.write_band(header)
+        for start in range(0, len(paths), COLS):
+            writer.write_band(render_band(paths[start : start + COLS], thumbs, width, label_font, start > 0))
+        writer.close()
+
+
+def sheet_title(game: str, category: str) -> str:
+    return f"{GAME_TITLES.get(game, game)} {category.replace('-', ' ')}"
+
+
+def render_sheets(
+    image_dir: Path,
+    out_dir: Path,
+    title: str,
+    per_sheet: int = PER_SHEET,
+    workers: int = 1,
+) -> list[Path]:
+    paths = sorted(image_dir.glob("*.png"))
+    if not paths:
+        raise SystemExit(f"no PNGs in {image_dir}")
+    thumbs = thumbnails(paths, (CELL_W - 16, CELL_H - 16), workers)
+    chunk = per_sheet or len(paths) or 1
+    sheets: list[Path] = []
+    for i in range(0, len(paths), chunk):
+        batch = paths[i : i + chunk]
+        out_path = out_dir / f"sheet_{i // chunk + 1:02d}.png"
+        make_sheet(batch, out_path, f"{title} {i + 1}-{i + len(batch)} of {len(paths)}", thumbs)
+        sheets.append(out_path)
+    return sheets
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("game", help="Game directory name, e.g. borderlands2")
+    parser.add_argument("category", help="Category directory name, e.g. shields")
+    parser.add_argument("--image-dir", type=Path, help=f"Source PNGs (default: {IMAGE_ROOT}/<game>/<category>)")
+    parser.add_argument("--out-dir", type=Path, help=f"Sheet output (default: {OUT_ROOT}/<game>/<category>)")
+    parser.add_argument("--per-sheet", type=int, default=PER_SHEET, help="Cells per sheet; 0 renders the whole category as one sheet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes for uncached thumbnails")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    image_dir = args.image_dir or IMAGE_ROOT / args.game / args.category
+    out_dir = args.out_dir or OUT_ROOT / args.game / args.category
+    for sheet in render_sheets(image_dir, out_dir, sheet_title(args.game, args.category), args.per_sheet, args.workers):
+        print(sheet)
+
+
+if __name__ == "__main__":
+    main()
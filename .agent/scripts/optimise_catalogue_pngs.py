@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from catalogue_images import sha256_file
+from image_manifest import image_paths
+
+
+LEDGER_PATH = Path(".agent/index/png-optimise-ledger.json")
+
+# A 256-colour quantised copy is only kept when it is visually indistinguishable from the original.
+QUANTIZE_MIN_PSNR = 42.0
+
+# zlib strategies tried per candidate: Z_DEFAULT_STRATEGY suits palette images, Z_FILTERED most truecolour ones.
+ZLIB_STRATEGIES = (0, 1)
+
+
+def ledger_params(quantize: bool) -> dict:
+    return {
+        "encoder": "pillow",
+        "strategies": list(ZLIB_STRATEGIES),
+        "quantize": quantize,
+        "min_psnr": QUANTIZE_MIN_PSNR if quantize else None,
+    }
+
+
+def pixels(im: Image.Image) -> np.ndarray:
+    return np.asarray(im.convert("RGBA"))
+
+
+def exact_palette(rgba: np.ndarray) -> Image.Image | None:
+    flat = rgba.reshape(-1, 4)
+    colors, inverse = np.unique(flat, axis=0, return_inverse=True)
+    if len(colors) > 256:
+        return None
+    indexed = Image.fromarray(inverse.reshape(rgba.shape[:2]).astype(np.uint8), "P")
+    indexed.putpalette(colors[:, :3].astype(np.uint8).tobytes())
+    if (colors[:, 3] != 255).any():
+        indexed.info["transparency"] = colors[:, 3].astype(np.uint8).tobytes()
+    return indexed
+
+
+def lossless_candidates(im: Image.Image, rgba: np.ndarray) -> list[tuple[str, Image.Image]]:
+    # Re-encoding in the original mode comes first; smaller lossless modes are only tried when they differ from it.
+    candidates = [("recompressed", im)]
+    opaque = bool((rgba[..., 3] == 255).all())
+    if opaque:
+        rgb = rgba[..., :3]
+        if im.mode not in ("RGB", "L", "P"):
+            candidates.append(("rgb", Image.fromarray(rgb, "RGB")))
+        if im.mode != "L" and (rgb[..., 0] == rgb[..., 1]).all() and (rgb[..., 1] == rgb[..., 2]).all():
+            candidates.append(("grey", Image.fromarray(rgb[..., 0], "L")))
+    if im.mode != "P":
+        palette = exact_palette(rgba)
+        if palette is not None:
+            candidates.append(("palette", palette))
+    return candidates
+
+
+def psnr(left: np.ndarray, right: np.ndarray) -> float:
+    error = np.mean((left.astype(np.float64) - right.astype(np.float64)) ** 2)
+    return float("inf") if error == 0 else float(10 * np.log10(255 ** 2 / error))
+
+
+def quantized_candidate(im: Image.Image, rgba: np.ndarray) -> tuple[str, Image.Image] | None:
+    # Flat-shaded weapon art usually survives 256 colours; photos and gradients fail the PSNR check and are left alone.
+    opaque = bool((rgba[..., 3] == 255).all())
+    source = im.convert("RGB") if opaque else im.convert("RGBA")
+    method = Image.Quantize.MEDIANCUT if opaque else Image.Quantize.FASTOCTREE
+    quantized = source.quantize(colors=256, method=method, dither=Image.Dither.NONE)
+    score = psnr(rgba, pixels(quantized))
+    if score < QUANTIZE_MIN_PSNR:
+        return None
+    return f"quantized-{score:.1f}db", quantized
+
+
+def encode(im: Image.Image) -> bytes:
+    best = b""
+    for strategy in ZLIB_STRATEGIES:
+        buffer = BytesIO()
+        params = {"optimize": True, "compress_type": strategy}
+        if "transparency" in im.info:
+            params["transparency"] = im.info["transparency"]
+        im.save(buffer, format="PNG", **params)
+        if not best or buffer.tell() < len(best):
+            best = buffer.getvalue()
+    return best
+
+
+def optimise(task: tuple[str, bool]) -> dict:
+    path, quantize = task
+    original_bytes = os.path.getsize(path)
+    with Image.open(path) as im:
+        im.load()
+        rgba = pixels(im)
+        candidates = lossless_candidates(im, rgba)
+        if quantize:
+            quantized = quantized_candidate(im, rgba)
+            if quantized is not None:
+                candidates.append(quantized)
+
+        best_name, best_data = "", b""
+        for name, candidate in candidates:
+            data = encode(candidate)
+            if best_data and len(data) >= len(best_data):
+                continue
+            if not name.startswith("quantized"):
+                # Lossless candidates must round-trip to exactly the same RGBA pixels before they can win.
+                with Image.open(BytesIO(data)) as check:
+                    if not np.array_equal(pixels(check), rgba):
+                        continue
+            best_name, best_data = name, data
+
+    if not best_data or len(best_data) >= original_bytes:
+        return {"file": path, "kept": "original", "bytes": original_bytes, "saved": 0}
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(best_data)
+    os.replace(tmp_path, path)
+    return {"file": path, "kept": best_name, "bytes": len(best_data), "saved": original_bytes - len(best_data)}
+
+
+def load_ledger(quantize: bool) -> dict[str, str]:
+    if not LEDGER_PATH.exists():
+        return {}
+    payload = json.loads(LEDGER_PATH.read_text(encoding="utf-8"))
+    if payload.get("params") != ledger_params(quantize):
+        return {}
+    return payload.get("files") or {}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", type=Path, help="Only optimise these PNGs (default: every catalogue PNG)")
+    parser.add_argument(
+        "--quantize",
+        action="store_true",
+        help=f"Also try a 256-colour palette, kept only at PSNR >= {QUANTIZE_MIN_PSNR} dB",
+    )
+    parser.add_argument("--full", action="store_true", help="Ignore the ledger and retry every file")
+    parser.add_argument("--dry-run", action="store_true", help="List the files that would be optimised")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    ledger = {} if args.full else load_ledger(args.quantize)
+    paths = args.paths or image_paths()
+
+    # The ledger holds each file's hash after its last pass, so anything untouched since then is skipped without decoding.
+    tasks: list[tuple[str, bool]] = []
+    digests: dict[str, str] = {}
+    for path in paths:
+        key = str(path)
+        digests[key] = sha256_file(path)
+        if ledger.get(key) != digests[key]:
+            tasks.append((key, args.quantize))
+
+    if args.dry_run:
+        print(json.dumps({"files": len(paths), "pending": [path for path, _ in tasks]}, indent=2))
+        return
+
+    workers = max(1, min(args.workers, len(tasks) or 1))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(optimise, tasks, chunksize=2))
+    else:
+        results = [optimise(task) for task in tasks]
+
+    for result in results:
+        digests[result["file"]] = sha256_file(Path(result["file"]))
+    ledger.update(digests)
+
+    LEDGER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    LEDGER_PATH.write_text(
+        f"{json.dumps({'params': ledger_params(args.quantize), 'files': dict(sorted(ledger.items()))}, indent=2)}\n",
+        encoding="utf-8",
+    )
+
+    kept: dict[str, int] = {}
+    for result in results:
+        kind = result["kept"].split("-")[0]
+        kept[kind] = kept.get(kind, 0) + 1
+    print(json.dumps({
+        "files": len(paths),
+        "skipped": len(paths) - len(tasks),
+        "optimised": sum(1 for result in results if result["saved"]),
+        "kept": kept,
+        "bytes_saved": sum(result["saved"] for result in results),
+        "ledger": str(LEDGER_PATH),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 import json
-import mimetypes
-import subprocess
+from io import BytesIO
 from pathlib import Path
-from urllib.parse import urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from PIL import Image
+
+try:
+    # Registers AVIF decoding on Pillow builds without native AVIF support.
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
 
 
 USER_AGENT = {"user-agent": "Mozilla/5.0 (compatible; BorderlensBot/1.0)"}
 ROOT = Path("data/games/borderlands2")
-TEMP_ROOT = Path(".agent/temp/lootlemon-page-image")
 
 
 def absolute_url(src: str) -> str:
@@ -23,17 +27,6 @@ def absolute_url(src: str) -> str:
     return src
 
 
-def guess_ext(image_url: str, content_type: str) -> str:
-    parsed = urlparse(image_url)
-    suffix = Path(parsed.path).suffix.lower()
-    if suffix:
-        return suffix
-    guessed = mimetypes.guess_extension((content_type or "").split(";")[0].strip())
-    if guessed:
-        return guessed
-    return ".img"
-
-
 def fetch_page_image_url(page_url: str) -> str:
     response = requests.get(page_url, headers=USER_AGENT, timeout=40)
     response.raise_for_status()
@@ -45,24 +38,19 @@ def fetch_page_image_url(page_url: str) -> str:
     return absolute_url(src)
 
 
-def download_to_temp(image_url: str, temp_path: Path) -> None:
+def download_bytes(image_url: str) -> bytes:
     response = requests.get(image_url, headers=USER_AGENT, timeout=60)
     response.raise_for_status()
-    temp_path.write_bytes(response.content)
+    return response.content
 
 
-def to_png(source: Path, destination: Path) -> None:
-    subprocess.run(
-        ["sips", "-s", "format", "png", str(source), "--out", str(destination)],
-        check=True,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
+def to_png(data: bytes, destination: Path) -> None:
+    # Decode AVIF/WEBP/JPG in memory and write the PNG directly; no temporary original is kept.
+    with Image.open(BytesIO(data)) as im:
+        im.convert("RGBA").save(destination, format="PNG")
 
 
 def main() -> None:
-    TEMP_ROOT.mkdir(parents=True, exist_ok=True)
-
     scanned = 0
     with_lootlemon = 0
     downloaded = 0
@@ -90,14 +78,7 @@ def main() -> None:
                 missing_page_image.append(str(path))
                 continue
 
-            head = requests.head(page_image, headers=USER_AGENT, timeout=30, allow_redirects=True)
-            content_type = head.headers.get("content-type", "")
-            ext = guess_ext(page_image, content_type)
-            temp_file = TEMP_ROOT / f"{slug}{ext}"
-
-            download_to_temp(page_image, temp_file)
-            to_png(temp_file, out_png)
-            temp_file.unlink(missing_ok=True)
+            to_png(download_bytes(page_image), out_png)
             downloaded += 1
         except Exception as error:  # noqa: BLE001
             failed.append({"file": str(path), "error": str(error)})
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+
+DATA_ROOT = Path("data/games")
+REGISTRY_PATH = Path(".agent/index/slug-registry.json")
+
+MAX_NUMBERED_SUFFIX = 50
+
+
+class SlugCollision(RuntimeError):
+    pass
+
+
+def normalize_name(value: str) -> str:
+    value = value.lower().replace("&", "and")
+    return re.sub(r"[^a-z0-9]+", "", value)
+
+
+def normalize_url(value: str) -> str:
+    parsed = urlparse(value.strip())
+    host = parsed.netloc.lower().removeprefix("www.")
+    path = unquote(parsed.path).replace(" ", "_").rstrip("/").lower()
+    return f"{host}{path}"
+
+
+def item_identity(doc: dict) -> dict[str, str | None]:
+    resources = doc.get("resources") or {}
+    identity: dict[str, str | None] = {"name": normalize_name(doc.get("name") or "")}
+    for source in ("lootlemon", "wiki"):
+        url = (resources.get(source) or "").strip()
+        identity[source] = normalize_url(url) if url else None
+    return identity
+
+
+def same_item(left: dict, right: dict) -> bool:
+    # URLs only ever get added, so a field missing on one side is no evidence either way; two different URLs for
+    # the same source always mean two items. Lootlemon pages are one-per-item, so a shared one decides it; wiki
+    # pages are sometimes shared by class variants, so otherwise the name must match too.
+    for source in ("lootlemon", "wiki"):
+        if left.get(source) and right.get(source) and left[source] != right[source]:
+            return False
+    if left.get("lootlemon") and left.get("lootlemon") == right.get("lootlemon"):
+        return True
+    return left.get("name") == right.get("name")
+
+
+def slot_key(game: str, category: str, slug: str) -> str:
+    return f"{game}/{category}/{slug}"
+
+
+class SlugRegistry:
+    def __init__(self, path: Path = REGISTRY_PATH) -> None:
+        self.path = path
+        self.slugs: dict[str, dict] = {}
+        self.names: dict[str, list[str]] = {}
+        self.rewrites: list[dict] = []
+        self.warnings: list[dict] = []
+        if path.exists():
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            self.slugs = payload.get("slugs") or {}
+            self.names = payload.get("names") or {}
+
+    def save(self) -> None:
+        # write_item only updates memory; callers save once after their last write.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"slugs": self.slugs, "names": self.names}
+        self.path.write_text(f"{json.dumps(payload, indent=2, sort_keys=True)}\n", encoding="utf-8")
+
+    def lookup_name(self, game: str, name: str) -> list[str]:
+        return list(self.names.get(f"{game}:{normalize_name(name)}", []))
+
+    def _record(self, game: str, category: str, slug: str, doc: dict, path: Path) -> None:
+        key = slot_key(game, category, slug)
+        self._forget(key)
+        name = doc.get("name") or ""
+        self.slugs[key] = {"file": str(path), "identity": item_identity(doc), "name": name}
+        owners = self.names.setdefault(f"{game}:{normalize_name(name)}", [])
+        if key not in owners:
+            owners.append(key)
+
+    def _forget(self, key: str) -> None:
+        entry = self.slugs.pop(key, None)
+        if entry is None:
+            return
+        game = key.split("/", 1)[0]
+        name_key = f"{game}:{normalize_name(entry.get('name') or '')}"
+        owners = [owner for owner in self.names.get(name_key, []) if owner != key]
+        if owners:
+            self.names[name_key] = owners
+        else:
+            self.names.pop(name_key, None)
+
+    def _known(self, game: str, category: str, slug: str) -> dict | None:
+        key = slot_key(game, category, slug)
+        path = DATA_ROOT / game / category / f"{slug}.json"
+        entry = self.slugs.get(key)
+        if entry is not None:
+            if not path.exists():
+                self._forget(key)
+                return None
+            if isinstance(entry.get("identity"), dict):
+                return entry
+            # Entries from before identities were field records are re-read from their file once.
+            self._forget(key)
+        # Files written before the registry existed are adopted lazily, one stat per claimed slug.
+        if path.exists():
+            self._record(game, category, slug, json.loads(path.read_text(encoding="utf-8")), path)
+            return self.slugs[key]
+        return None
+
+    def _candidate_slugs(self, slug: str, suffix: str | None) -> list[str]:
+        candidates = [slug]
+        if suffix and not slug.endswith(f"-{suffix}"):
+            candidates.append(f"{slug}-{suffix}")
+        base = candidates[-1]
+        candidates.extend(f"{base}-{index}" for index in range(2, MAX_NUMBERED_SUFFIX + 1))
+        return candidates
+
+    def _warn_elsewhere(self, game: str, category: str, slug: str, doc: dict) -> None:
+        identity = item_identity(doc)
+        game_dir = DATA_ROOT / game
+        if game_dir.is_dir():
+            for other in sorted(path.name for path in game_dir.iterdir() if path.is_dir()):
+                if other == category:
+                    continue
+                entry = self._known(game, other, slug)
+                if entry is not None and not same_item(entry["identity"], identity):
+                    self.warnings.append({
+                        "slug": slot_key(game, category, slug),
+                        "reason": "slug also used in another category",
+                        "other": slot_key(game, other, slug),
+                    })
+
+        # Same-name variants inside one category are expected (class mods); flag only other categories.
+        for owner in self.lookup_name(game, doc.get("name") or ""):
+            if owner.split("/")[1] == category:
+                continue
+            entry = self._known(*owner.split("/"))
+            if entry is not None and not same_item(entry["identity"], identity):
+                self.warnings.append({
+                    "slug": slot_key(game, category, slug),
+                    "reason": "normalised name already registered",
+                    "other": owner,
+                })
+
+    def claim(self, game: str, category: str, slug: str, doc: dict, suffix: str | None = None,
+              policy: str = "rewrite") -> str:
+        identity = item_identity(doc)
+        for candidate in self._candidate_slugs(slug, suffix):
+            existing = self._known(game, category, candidate)
+            if existing is not None and not same_item(existing["identity"], identity):
+                if policy == "refuse":
+                    raise SlugCollision(
+                        f"{slot_key(game, category, candidate)} already belongs to {existing['name']} ({existing['identity']})"
+                    )
+                continue
+            if candidate != slug:
+                self.rewrites.append({
+                    "from": slot_key(game, category, slug),
+                    "to": slot_key(game, category, candidate),
+                    "name": doc.get("name"),
+                })
+            self._warn_elsewhere(game, category, candidate, doc)
+            return candidate
+        raise SlugCollision(f"no free slug for {slot_key(game, category, slug)}")
+
+    def write_item(self, output_dir: Path, doc: dict, suffix: str | None = None, policy: str = "rewrite") -> Path:
+        game, category = output_dir.parent.name, output_dir.name
+        slug = self.claim(game, category, doc["slug"], doc, suffix=suffix, policy=policy)
+        if slug != doc["slug"]:
+            doc["slug"] = slug
+            if "image" in doc:
+                doc["image"] = f"/img/games/{game}/{category}/{slug}.png"
+
+        path = output_dir / f"{slug}.json"
+        path.write_text(f"{json.dumps(doc, indent=2, ensure_ascii=True)}\n", encoding="utf-8")
+        self._record(game, category, slug, doc, path)
+        return path
+
+    def summary(self) -> dict:
+        return {
+            "registered": len(self.slugs),
+            "rewrites": self.rewrites,
+            "warnings": self.warnings,
+        }
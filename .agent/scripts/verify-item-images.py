@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from catalogue_images import DATA_ROOT, comparable, dhash, hamming, item_image_path, phash, ssim
+from image_manifest import ImageManifest
+from image_sources import SOURCES, load_source
+
+SHEET_DIR = Path(".agent/temp/image-verification")
+REPORT_PATH = Path(".agent/reports/image-verification-report.json")
+
+# Combined distance is in [0, 1]: hash distances are normalised by their 64 bits, SSIM by 1 - SSIM.
+PHASH_WEIGHT = 0.4
+DHASH_WEIGHT = 0.2
+SSIM_WEIGHT = 0.4
+DISTANCE_THRESHOLD = 0.35
+
+BG = (247, 244, 238)
+FG = (20, 20, 20)
+ALERT = (170, 40, 30)
+ACCENT = (210, 205, 196)
+CELL_W = 900
+CELL_H = 220
+COLS = 2
+PER_SHEET = 8
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("slugs", nargs="*", help="Only verify these slugs (default: every item in scope)")
+    parser.add_argument("--game", help="Limit to one game (default: every game under data/games)")
+    parser.add_argument("--category", help="Limit to one category (default: every category)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DISTANCE_THRESHOLD,
+        help="Combined distance at or above which an item is a mismatch and gets a review sheet",
+    )
+    parser.add_argument("--fetch-sources", action="store_true", help="Download missing Lootlemon/wiki images into the cache")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    return parser.parse_args()
+
+
+def fingerprint(path: Path, known_phash: Optional[int] = None) -> Tuple[int, int, Image.Image]:
+    with Image.open(path) as im:
+        gray = comparable(im)
+    return phash(gray) if known_phash is None else known_phash, dhash(gray), gray
+
+
+def compare(task: Tuple[str, str, Dict[str, str], Dict[str, int]]) -> dict:
+    key, local, sources, phashes = task
+    local_phash, local_dhash, local_gray = fingerprint(Path(local), phashes.get(local))
+    scores: Dict[str, dict] = {}
+    for source, path in sources.items():
+        source_phash, source_dhash, source_gray = fingerprint(Path(path), phashes.get(path))
+        phash_bits = hamming(local_phash, source_phash)
+        dhash_bits = hamming(local_dhash, source_dhash)
+        similarity = ssim(local_gray, source_gray)
+        distance = PHASH_WEIGHT * phash_bits / 64 + DHASH_WEIGHT * dhash_bits / 64 + SSIM_WEIGHT * (1 - max(similarity, 0.0))
+        scores[source] = {
+            "file": path,
+            "phash_bits": phash_bits,
+            "dhash_bits": dhash_bits,
+            "ssim": round(similarity, 4),
+            "distance": round(distance, 4),
+        }
+
+    # An image is right if it matches any source; sources disagree with each other often enough (renders vs scans).
+    best = min(scores, key=lambda source: scores[source]["distance"])
+    return {"item": key, "local": local, "distance": scores[best]["distance"], "closest": best, "sources": scores}
+
+
+def load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    for candidate in (
+        "/System/Library/Fonts/Supplemental/Menlo.ttc",
+        "/System/Library/Fonts/Supplemental/Courier New.ttf",
+    ):
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def place_image(canvas: Image.Image, image_path: Path, box: Tuple[int, int, int, int]) -> None:
+    with Image.open(image_path) as im:
+        im = im.convert("RGBA")
+        im.thumbnail((box[2] - box[0] - 20, box[3] - box[1] - 20), Image.LANCZOS)
+        px = box[0] + (box[2] - box[0] - im.width) // 2
+        py = box[1] + (box[3] - box[1] - im.height) // 2
+        canvas.alpha_composite(im, (px, py))
+
+
+def make_sheet(results: List[dict], out_path: Path, title: str) -> None:
+    rows = math.ceil(len(results) / COLS)
+    title_h = 42
+    canvas = Image.new("RGBA", (COLS * CELL_W, title_h + rows * CELL_H), BG + (255,))
+    draw = ImageDraw.Draw(canvas)
+    title_font = load_font(22)
+    label_font = load_font(16)
+    draw.rectangle((0, 0, canvas.width, title_h), fill=(230, 225, 216))
+    draw.text((16, 10), title, fill=FG, font=title_font)
+
+    for index, result in enumerate(results):
+        x0 = (index % COLS) * CELL_W
+        y0 = title_h + (index // COLS) * CELL_H
+        draw.rectangle((x0, y0, x0 + CELL_W, y0 + CELL_H), outline=ACCENT, width=1)
+        draw.text((x0 + 12, y0 + 10), f"{result['item']}  d={result['distance']:.3f}", fill=ALERT, font=label_font)
+
+        panels = [("local", result["local"])] + [
+            (f"{source} p{score['phash_bits']} d{score['dhash_bits']} s{score['ssim']:.2f}", score["file"])
+            for source, score in result["sources"].items()
+        ]
+        panel_w = CELL_W // len(panels)
+        for column, (caption, path) in enumerate(panels):
+            px0 = x0 + column * panel_w
+            box = (px0 + 8, y0 + 56, px0 + panel_w - 8, y0 + CELL_H - 8)
+            draw.text((px0 + 12, y0 + 32), caption, fill=FG, font=label_font)
+            draw.rectangle(box, outline=ACCENT, width=1)
+            place_image(canvas, Path(path), box)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    canvas.convert("RGB").save(out_path, quality=92)
+
+
+def main() -> None:
+    args = parse_args()
+    pattern = f"{args.game or '*'}/{args.category or '*'}/*.json"
+    wanted = set(args.slugs)
+
+    # The manifest's content pHash is the same one fingerprint() computes; it is reused for unchanged files.
+    manifest = ImageManifest.load()
+    tasks: List[Tuple[str, str, Dict[str, str], Dict[str, int]]] = []
+    missing_local: List[str] = []
+    missing_sources: List[str] = []
+    failures: List[Dict[str, str]] = []
+    items = 0
+
+    for json_path in sorted(DATA_ROOT.glob(pattern)):
+        item = json.loads(json_path.read_text(encoding="utf-8"))
+        slug = item.get("slug") or json_path.stem
+        if wanted and slug not in wanted:
+            continue
+        items += 1
+        key = f"{json_path.parent.parent.name}/{json_path.parent.name}/{slug}"
+        local = item_image_path(json_path, item)
+        if local is None:
+            missing_local.append(key)
+            continue
+        sources: Dict[str, str] = {}
+        for source in SOURCES:
+            path = load_source(json_path, item, source, args.fetch_sources, failures)
+            if path is not None:
+                sources[source] = str(path)
+        if not sources:
+            missing_sources.append(key)
+            continue
+        phashes: Dict[str, int] = {}
+        for path in [str(local), *sources.values()]:
+            entry = manifest.current(path)
+            if entry is not None:
+                phashes[path] = int(entry["phash"], 16)
+        tasks.append((key, str(local), sources, phashes))
+
+    workers = max(1, min(args.workers, len(tasks) or 1))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(compare, tasks, chunksize=4))
+    else:
+        results = [compare(task) for task in tasks]
+
+    results.sort(key=lambda result: result["distance"], reverse=True)
+    mismatches = [result for result in results if result["distance"] >= args.threshold]
+
+    by_game: Dict[str, List[dict]] = {}
+    for result in mismatches:
+        by_game.setdefault(result["item"].split("/", 1)[0], []).append(result)
+
+    sheets: List[str] = []
+    for game, game_mismatches in sorted(by_game.items()):
+        for start in range(0, len(game_mismatches), PER_SHEET):
+            out_path = SHEET_DIR / game / f"mismatches_{start // PER_SHEET + 1:02d}.png"
+            title = f"{game}: local image vs sources, distance >= {args.threshold}"
+            make_sheet(game_mismatches[start : start + PER_SHEET], out_path, title)
+            sheets.append(str(out_path))
+
+    report = {
+        "completedAt": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "game": args.game,
+        "category": args.category,
+        "threshold": args.threshold,
+        "weights": {"phash": PHASH_WEIGHT, "dhash": DHASH_WEIGHT, "ssim": SSIM_WEIGHT},
+        "items": items,
+        "compared": len(results),
+        "mismatches": len(mismatches),
+        "missing_local": missing_local,
+        "missing_sources": missing_sources,
+        "source_failures": failures,
+        "sheets": sheets,
+        "ranked": results,
+    }
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(f"{json.dumps(report, indent=2)}\n", encoding="utf-8")
+
+    summary = {key: report[key] for key in ("items", "compared", "mismatches", "sheets")}
+    summary["missing_local"] = len(missing_local)
+    summary["missing_sources"] = len(missing_sources)
+    summary["source_failures"] = len(failures)
+    print(json.dumps(summary, indent=2))
+    print(f"Report: {REPORT_PATH}")
+
+
+if __name__ == "__main__":
+    main()